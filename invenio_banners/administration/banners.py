@@ -7,6 +7,8 @@
 
 """Invenio administration banners view module."""
 
+from functools import partial
+
 from invenio_administration.views.base import (
     AdminResourceCreateView,
     AdminResourceDetailView,
@@ -48,6 +50,13 @@ class BannerListView(AdminResourceListView):
     search_config_name = "BANNERS_SEARCH"
     search_sort_config_name = "BANNERS_SORT_OPTIONS"
 
+    def init_search_config(self, **kwargs):
+        """Build search view config, without counting all the matching banners."""
+        return partial(
+            super().init_search_config(**kwargs),
+            endpoint=f"{self.get_api_endpoint(**kwargs)}?track_total=false",
+        )
+
 
 class BannerEditView(AdminResourceEditView):
     """Configuration for Banner edit view."""
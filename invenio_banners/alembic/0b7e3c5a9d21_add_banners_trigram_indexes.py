@@ -0,0 +1,43 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2024 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add trigram indexes for the banners text search."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0b7e3c5a9d21"
+down_revision = "96355f4280f8"
+branch_labels = ()
+depends_on = None
+
+COLUMNS = ("message", "url_path", "category")
+
+
+def upgrade():
+    """Upgrade database."""
+    # the text search falls back to an in-process index on other databases
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in COLUMNS:
+        op.create_index(
+            f"ix_banners_{column}_trgm",
+            "banners",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade():
+    """Downgrade database."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    for column in reversed(COLUMNS):
+        op.drop_index(f"ix_banners_{column}_trgm", table_name="banners")
@@ -0,0 +1,49 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2024 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add indexes on banners schedule and sort columns."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "96355f4280f8"
+down_revision = "f2f662e742e1"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(
+        "ix_banners_active_start_datetime_end_datetime",
+        "banners",
+        ["active", "start_datetime", "end_datetime"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_banners_end_datetime_active",
+        "banners",
+        ["end_datetime"],
+        unique=False,
+        postgresql_where=sa.column("active", sa.Boolean).is_(True),
+        sqlite_where=sa.column("active", sa.Boolean).is_(True),
+    )
+    op.create_index(
+        op.f("ix_banners_start_datetime"), "banners", ["start_datetime"], unique=False
+    )
+    op.create_index(
+        op.f("ix_banners_end_datetime"), "banners", ["end_datetime"], unique=False
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(op.f("ix_banners_end_datetime"), table_name="banners")
+    op.drop_index(op.f("ix_banners_start_datetime"), table_name="banners")
+    op.drop_index("ix_banners_end_datetime_active", table_name="banners")
+    op.drop_index("ix_banners_active_start_datetime_end_datetime", table_name="banners")
@@ -0,0 +1,26 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2024 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add index on banners url_path."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2f662e742e1"
+down_revision = "5e02314da32e"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_index(op.f("ix_banners_url_path"), "banners", ["url_path"], unique=False)
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(op.f("ix_banners_url_path"), table_name="banners")
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Process-local cache of the active banners."""
+
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from itertools import chain
+from operator import attrgetter
+
+import sqlalchemy as sa
+from flask import (
+    current_app,
+    g,
+    has_app_context,
+    has_request_context,
+    render_template,
+    request,
+)
+from markupsafe import Markup
+
+from .records.models import BannerModel
+
+ActiveBanner = namedtuple(
+    "ActiveBanner",
+    ["id", "message", "url_path", "category", "start_datetime", "end_datetime"],
+)
+"""Detached, read-only copy of an active banner row."""
+
+
+class _Node:
+    """Node of the url path radix tree."""
+
+    __slots__ = ("children", "banners")
+
+    def __init__(self):
+        """Constructor."""
+        # first character of the edge -> (edge label, child node)
+        self.children = {}
+        self.banners = []
+
+
+class BannersIndex:
+    """Radix tree of banners keyed by their url path.
+
+    Site-wide banners are stored at the root. Looking up a path walks down the
+    edges matching it and collects the banners of every node on the way, so
+    the cost depends on the length of the path and not on the number of
+    banners. Edges are split on characters rather than on ``/`` to keep the
+    plain prefix semantics of ``url_path``.
+    """
+
+    def __init__(self, banners):
+        """Constructor."""
+        self._root = _Node()
+        for banner in banners:
+            self._insert(banner)
+
+    def _insert(self, banner):
+        node = self._root
+        key = banner.url_path or ""
+        while key:
+            edge = node.children.get(key[0])
+            if edge is None:
+                child = _Node()
+                node.children[key[0]] = (key, child)
+                node, key = child, ""
+                break
+
+            label, child = edge
+            common = len(os.path.commonprefix([label, key]))
+            if common < len(label):
+                # split the edge where the keys diverge
+                middle = _Node()
+                middle.children[label[common]] = (label[common:], child)
+                node.children[key[0]] = (label[:common], middle)
+                child = middle
+            node, key = child, key[common:]
+
+        node.banners.append(banner)
+
+    def resolve(self, url_path):
+        """Return the banners whose url path is a prefix of the given one."""
+        node = self._root
+        result = list(node.banners)
+        rest = url_path
+        while rest:
+            edge = node.children.get(rest[0])
+            if edge is None:
+                break
+            label, node = edge
+            if not rest.startswith(label):
+                break
+            result.extend(node.banners)
+            rest = rest[len(label) :]
+
+        result.sort(key=attrgetter("id"))
+        return result
+
+
+class BannersSnapshot:
+    """Immutable set of the banners active when the snapshot was built."""
+
+    def __init__(self, banners, expires_at=None, valid_until=None):
+        """Constructor."""
+        self.banners = tuple(banners)
+        self.expires_at = expires_at
+        self.valid_until = valid_until
+        self.version = hashlib.sha1(repr(self.banners).encode("utf-8")).hexdigest()
+        self.index = BannersIndex(self.banners)
+        # rendered HTML per (banner ids, locale)
+        self.fragments = {}
+
+    @classmethod
+    def build(cls, ttl=None):
+        """Load the active banners from the database.
+
+        The snapshot is valid until the next scheduled start or end of a
+        banner, and at most ``ttl`` seconds when given.
+        """
+        now = datetime.utcnow()
+        banners = [
+            ActiveBanner(
+                id=banner.id,
+                message=banner.message,
+                url_path=banner.url_path,
+                category=banner.category,
+                start_datetime=banner.start_datetime,
+                end_datetime=banner.end_datetime,
+            )
+            for banner in BannerModel.get_all_active(now)
+        ]
+        return cls(
+            banners,
+            expires_at=time.monotonic() + ttl if ttl is not None else None,
+            valid_until=BannerModel.get_next_transition(now),
+        )
+
+    @property
+    def expired(self):
+        """Whether the snapshot outlived its time to live or schedule."""
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            return True
+        if self.valid_until is not None and datetime.utcnow() >= self.valid_until:
+            return True
+        return False
+
+    def resolve(self, url_path):
+        """Return the banners to show for the given url path."""
+        return self.index.resolve(url_path)
+
+    def render(self, url_path, locale, template):
+        """Return the rendered HTML of the banners for the given url path."""
+        banners = self.resolve(url_path)
+        key = (tuple(banner.id for banner in banners), locale)
+        html = self.fragments.get(key)
+        if html is None:
+            html = Markup(render_template(template, banners=banners))
+            self.fragments[key] = html
+        return html
+
+
+class ActiveBannersCache:
+    """Hold a snapshot of the active banners in memory.
+
+    The snapshot is refreshed when a banner is scheduled to start or end,
+    after ``BANNERS_ACTIVE_CACHE_TTL`` seconds, and dropped as soon as a
+    banner is written through this process.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._snapshot = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self):
+        """Return a valid snapshot, building a new one if needed."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.expired:
+            snapshot = self.refresh()
+        return snapshot
+
+    def get(self, url_path):
+        """Return the active banners for the given url path."""
+        return self.snapshot.resolve(url_path)
+
+    def refresh(self):
+        """Rebuild the snapshot from the database."""
+        with self._lock:
+            snapshot = self._snapshot
+            # another thread may have refreshed it while we were waiting
+            if snapshot is None or snapshot.expired:
+                generation = self._generation
+                snapshot = BannersSnapshot.build(
+                    current_app.config["BANNERS_ACTIVE_CACHE_TTL"]
+                )
+                # a write committed while building may be missing from it
+                if generation == self._generation:
+                    self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        """Drop the current snapshot, and any snapshot being built."""
+        self._generation += 1
+        self._snapshot = None
+        # lookups memoized by the current request may be stale as well
+        if has_app_context():
+            g.pop(_REQUEST_MEMO_KEY, None)
+
+
+_REQUEST_MEMO_KEY = "_banners_memo"
+
+
+def request_memo():
+    """Return the memo of active banners lookups for the current request.
+
+    The memo is kept on ``g`` with the request it belongs to, since the
+    application context can outlive the request. Outside of a request
+    nothing is memoized.
+    """
+    if not has_request_context():
+        return {}
+    current_request = request._get_current_object()
+    owner, memo = g.get(_REQUEST_MEMO_KEY, (None, None))
+    if owner is not current_request:
+        memo = {}
+        setattr(g, _REQUEST_MEMO_KEY, (current_request, memo))
+    return memo
+
+
+#
+# Invalidation on writes
+#
+_SESSION_KEY = "invenio_banners.modified"
+
+
+def _invalidate_current_app():
+    """Invalidate the active banners cache and text index of the current app."""
+    if not has_app_context():
+        return
+    ext = current_app.extensions.get("invenio-banners")
+    if ext is not None:
+        ext.active_banners_cache.invalidate()
+        ext.text_index.invalidate()
+
+
+def _mark_modified(session):
+    session.info[_SESSION_KEY] = True
+    _invalidate_current_app()
+
+
+def _after_flush(session, flush_context):
+    objs = chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(obj, BannerModel) for obj in objs):
+        _mark_modified(session)
+
+
+def _do_orm_execute(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is BannerModel:
+            _mark_modified(orm_execute_state.session)
+
+
+def _after_commit(session):
+    # drop anything built from data that was not yet committed
+    if session.info.pop(_SESSION_KEY, False):
+        _invalidate_current_app()
+
+
+def _after_soft_rollback(session, previous_transaction):
+    _after_commit(session)
+
+
+def register_invalidation_hooks():
+    """Invalidate the cache whenever banners are written to the database."""
+    for name, fn in (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("after_commit", _after_commit),
+        ("after_soft_rollback", _after_soft_rollback),
+    ):
+        if not sa.event.contains(sa.orm.Session, name, fn):
+            sa.event.listen(sa.orm.Session, name, fn)
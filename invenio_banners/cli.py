@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Command line interface for banners."""
+
+import csv
+import json
+from datetime import timedelta
+from itertools import islice
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from invenio_access.permissions import system_identity
+
+from .proxies import current_banners_service
+from .synthetic import BannerGenerator, seed_banners
+
+NULLABLE_CSV_FIELDS = ("url_path", "end_datetime")
+"""CSV columns whose empty values are read as null."""
+
+
+def _read_ndjson(source):
+    """Iterate over the banners of a newline delimited JSON file."""
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise click.ClickException(f"Invalid JSON on line {number}: {e}.")
+
+
+def _read_csv(source):
+    """Iterate over the banners of a CSV file with a header."""
+    for row in csv.DictReader(source):
+        for field in NULLABLE_CSV_FIELDS:
+            if row.get(field) == "":
+                row[field] = None
+        yield row
+
+
+def _weights(ctx, param, value):
+    """Parse ``name=weight,...`` into a dict."""
+    if value is None:
+        return None
+    try:
+        return {
+            name.strip(): float(weight)
+            for name, weight in (item.split("=") for item in value.split(","))
+        }
+    except ValueError:
+        raise click.BadParameter("Expected name=weight pairs, e.g. info=6,warning=3.")
+
+
+@click.group()
+def banners():
+    """Banners commands."""
+
+
+@banners.command("import")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format",
+    "format_",
+    type=click.Choice(["ndjson", "csv"]),
+    help="Format of the file, guessed from its extension by default.",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    help="Banners inserted per statement, BANNERS_IMPORT_CHUNK_SIZE by default.",
+)
+@with_appcontext
+def import_banners(source, format_, chunk_size):
+    """Import banners from an NDJSON or CSV file, e.g. an export.
+
+    Ids are not kept, the imported banners get new ones.
+    """
+    if format_ is None:
+        format_ = "csv" if source.name.lower().endswith(".csv") else "ndjson"
+    if chunk_size is None:
+        chunk_size = current_app.config["BANNERS_IMPORT_CHUNK_SIZE"]
+    rows = _read_csv(source) if format_ == "csv" else _read_ndjson(source)
+
+    imported = failed = offset = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        inserted, errors = current_banners_service.import_many(system_identity, chunk)
+        for error in errors:
+            messages = "; ".join(
+                f"{e['field']}: {' '.join(e['messages'])}" for e in error["errors"]
+            )
+            click.secho(f"Row {offset + error['index'] + 1}: {messages}", fg="red")
+        imported += inserted
+        failed += len(errors)
+        offset += len(chunk)
+        click.echo(f"Processed {offset} rows, {imported} banners imported.")
+
+    click.secho(
+        f"Imported {imported} banners, {failed} rows failed.",
+        fg="red" if failed else "green",
+    )
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+@banners.command("seed")
+@click.option("--count", type=click.IntRange(min=0), default=1000, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--categories",
+    callback=_weights,
+    help="Weight of each category, e.g. info=6,warning=3,other=1.",
+)
+@click.option(
+    "--expired",
+    type=click.FloatRange(0, 1),
+    default=0.9,
+    show_default=True,
+    help="Fraction of banners that already ended.",
+)
+@click.option(
+    "--live",
+    type=click.FloatRange(0, 1),
+    default=0.05,
+    show_default=True,
+    help="Fraction of banners currently running, the rest are scheduled.",
+)
+@click.option("--max-depth", type=click.IntRange(min=0), default=5, show_default=True)
+@click.option(
+    "--max-duration-days",
+    type=click.FloatRange(min=0, min_open=True),
+    default=14,
+    show_default=True,
+    help="Maximum duration of a banner, the longer the more schedules overlap.",
+)
+@click.option(
+    "--message-size",
+    type=(click.IntRange(min=1), click.IntRange(min=1)),
+    default=(20, 500),
+    show_default=True,
+    help="Minimum and maximum length of the messages.",
+)
+@click.option("--chunk-size", type=click.IntRange(min=1), default=10000)
+@with_appcontext
+def seed(
+    count,
+    seed,
+    categories,
+    expired,
+    live,
+    max_depth,
+    max_duration_days,
+    message_size,
+    chunk_size,
+):
+    """Insert deterministic synthetic banners, e.g. for load tests."""
+    if categories:
+        known = {category for category, _ in current_app.config["BANNERS_CATEGORIES"]}
+        unknown = set(categories) - known
+        if unknown:
+            raise click.BadParameter(
+                f"Unknown categories: {', '.join(sorted(unknown))}.",
+                param_hint="--categories",
+            )
+    try:
+        generator = BannerGenerator(
+            seed=seed,
+            categories=categories,
+            expired=expired,
+            live=live,
+            max_depth=max_depth,
+            duration=(timedelta(hours=1), timedelta(days=max_duration_days)),
+            message_size=message_size,
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    inserted = seed_banners(
+        count,
+        generator,
+        chunk_size=chunk_size,
+        progress=lambda inserted: click.echo(f"Inserted {inserted} banners."),
+    )
+    click.secho(f"Seeded {inserted} banners.", fg="green")
@@ -7,6 +7,8 @@
 
 """Configuration variables."""
 
+from datetime import timedelta
+
 from invenio_i18n import lazy_gettext as _
 
 from invenio_banners.utils import style_category
@@ -21,9 +23,84 @@ BANNERS_CATEGORIES = [
 BANNERS_CATEGORIES_TO_STYLE = style_category
 """Function to transform the banner category to a specific Semantic-UI class."""
 
+BANNERS_TEXT_INDEX_TTL = 60
+"""Maximum seconds during which the in-process text search index is reused.
+
+Only used on databases without trigram indexes. Writes done by this process
+invalidate the index immediately, other processes pick up changes once their
+index expires. Set to ``None`` to only rely on invalidation.
+"""
+
+BANNERS_ACTIVE_CACHE_TTL = 60
+"""Maximum seconds during which the snapshot of active banners is reused.
+
+The snapshot is rebuilt anyway when a banner is scheduled to start or end.
+Writes done by this process invalidate the snapshot immediately, other
+processes pick up changes once their snapshot expires. Set to ``None`` to
+only rely on the schedule and on invalidation.
+"""
+
+BANNERS_ACTIVE_TEMPLATE = "semantic-ui/invenio_banners/active_banners.html"
+"""Template rendering the active banners, cached along with the snapshot."""
+
+BANNERS_ACTIVE_MAX_AGE = 60
+"""Maximum ``Cache-Control`` max-age (seconds) of the active banners endpoint.
+
+The max-age is further limited to the next scheduled start or end of a banner.
+"""
+
+BANNERS_ACTIVE_MAX_URL_PATHS = 1000
+"""Maximum number of url paths in a single active banners lookup."""
+
+BANNERS_COMPILED_DUMPER = True
+"""Dump banners with a function compiled from the service schema.
+
+The output is identical to the marshmallow dump; schemas with dump hooks or
+unsupported fields fall back to marshmallow.
+"""
+
+BANNERS_EXPORT_BATCH_SIZE = 1000
+"""Number of banners fetched and serialized at a time by the export."""
+
+BANNERS_IMPORT_CHUNK_SIZE = 1000
+"""Number of banners validated and inserted at a time by ``banners import``."""
+
+BANNERS_MESSAGE_SUMMARY_LENGTH = 200
+"""Maximum number of characters of the message summary of list views.
+
+The database only returns the beginning of the message, four times as long
+to leave room for its HTML tags, which are then stripped.
+"""
+
+BANNERS_BULK_MAX_ITEMS = 1000
+"""Maximum number of banners in a single bulk create, update or delete."""
+
+BANNERS_PREFETCH_ACTIVE = False
+"""Load the active banners in a ``before_request`` hook instead of on render."""
+
+BANNERS_TRANSITION_LOOKAHEAD = timedelta(minutes=5)
+"""Period of the task queueing the expiry for the next banner transition."""
+
+BANNERS_CELERY_BEAT_SCHEDULE = {
+    "banners-disable-expired": {
+        "task": "invenio_banners.tasks.disable_expired_banners",
+        "schedule": timedelta(minutes=10),
+    },
+    "banners-schedule-transition": {
+        "task": "invenio_banners.tasks.schedule_banners_transition",
+    },
+}
+"""Periodic banner tasks, added to ``CELERY_BEAT_SCHEDULE`` unless overridden.
+
+The transition task runs every ``BANNERS_TRANSITION_LOOKAHEAD`` unless its
+entry sets a schedule. Set to an empty dict to schedule the tasks from the
+instance configuration only.
+"""
+
 BANNERS_SEARCH = {
     "facets": [],
     "sort": [
+        "bestmatch",
         "url_path",
         "start_datetime",
         "end_datetime",
@@ -33,6 +110,10 @@ BANNERS_SEARCH = {
 """Banner search configuration (i.e list of banners)"""
 
 BANNERS_SORT_OPTIONS = {
+    "bestmatch": dict(
+        title=_("Best match"),
+        fields=[],
+    ),
     "url_path": dict(
         title=_("URL path"),
         fields=["url_path"],
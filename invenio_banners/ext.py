@@ -10,9 +10,15 @@
 from flask import Blueprint
 
 from . import config
+from .cache import ActiveBannersCache, register_invalidation_hooks
+from .fulltext import TextIndexCache
 from .resources import BannerResource, BannerResourceConfig
 from .services import BannerService, BannerServiceConfig
-from .utils import get_active_banners_for_request
+from .utils import (
+    get_active_banners_for_request,
+    prefetch_active_banners,
+    render_active_banners_for_request,
+)
 
 blueprint = Blueprint(
     "invenio_banners",
@@ -35,12 +41,19 @@ class InvenioBanners(object):
         self.init_config(app)
         self.init_services(app)
         self.init_resources(app)
+        self.init_cache(app)
+        self.init_beat_schedule(app)
         app.extensions["invenio-banners"] = self
         app.register_blueprint(blueprint)
         app.jinja_env.globals["get_active_banners"] = get_active_banners_for_request
+        app.jinja_env.globals[
+            "render_active_banners"
+        ] = render_active_banners_for_request
         app.jinja_env.filters["style_banner_category"] = app.config[
             "BANNERS_CATEGORIES_TO_STYLE"
         ]
+        if app.config["BANNERS_PREFETCH_ACTIVE"]:
+            app.before_request(prefetch_active_banners)
 
     def init_config(self, app):
         """Initialize configuration."""
@@ -52,6 +65,39 @@ class InvenioBanners(object):
         """Initialize the services for banners."""
         self.banners_service = BannerService(config=BannerServiceConfig)
 
+    def init_cache(self, app):
+        """Initialize the in-memory cache of active banners and text index."""
+        self.active_banners_cache = ActiveBannersCache()
+        self.text_index = TextIndexCache()
+        register_invalidation_hooks()
+
+    def init_beat_schedule(self, app):
+        """Add the periodic banner tasks to the Celery beat schedule."""
+        entries = app.config["BANNERS_CELERY_BEAT_SCHEDULE"]
+        if not entries:
+            return
+        # the transition task must run as often as it looks ahead
+        transition_task = "invenio_banners.tasks.schedule_banners_transition"
+        lookahead = app.config["BANNERS_TRANSITION_LOOKAHEAD"]
+        entries = {
+            name: (
+                {"schedule": lookahead, **entry}
+                if entry.get("task") == transition_task
+                else entry
+            )
+            for name, entry in entries.items()
+        }
+        schedule = app.config.setdefault("CELERY_BEAT_SCHEDULE", {})
+        for name, entry in entries.items():
+            schedule.setdefault(name, entry)
+        # the Celery app may already hold a copy of the configuration
+        celery_ext = app.extensions.get("invenio-celery")
+        if celery_ext is not None:
+            celery_ext.celery.conf.beat_schedule = {
+                **entries,
+                **(celery_ext.celery.conf.beat_schedule or {}),
+            }
+
     def init_resources(self, app):
         """Initialize the resources for banners."""
         self.banners_resource = BannerResource(
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Text search over the banners."""
+
+import threading
+import time
+from collections import defaultdict
+
+import sqlalchemy as sa
+from flask import current_app
+from invenio_db import db
+
+from .proxies import current_banners_text_index
+from .records.models import BannerModel
+
+TRIGRAM_SIZE = 3
+
+SEARCH_FIELDS = ("message", "url_path", "category")
+"""Banner fields matched by the text search."""
+
+
+LIKE_ESCAPE = "/"
+"""Escape character of the ``LIKE`` patterns, as with ``autoescape=True``."""
+
+
+def escape_like(value):
+    """Escape the ``LIKE`` wildcards of a value with :data:`LIKE_ESCAPE`."""
+    for char in (LIKE_ESCAPE, "%", "_"):
+        value = value.replace(char, LIKE_ESCAPE + char)
+    return value
+
+
+def _trigrams(text):
+    return {text[i : i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """In-process inverted index of the searchable text of the banners.
+
+    Every lowercased field is split into overlapping trigrams pointing to the
+    banners containing them. A query only compares the banners sharing all of
+    its trigrams, found by intersecting the smallest posting lists first, and
+    ranks them by the share of the matched field covered by the query.
+    """
+
+    def __init__(self, rows):
+        """Constructor."""
+        self._documents = {}
+        self._postings = defaultdict(set)
+        for row in rows:
+            texts = tuple((getattr(row, f) or "").lower() for f in SEARCH_FIELDS)
+            self._documents[row.id] = texts
+            for text in texts:
+                for trigram in _trigrams(text):
+                    self._postings[trigram].add(row.id)
+
+    @classmethod
+    def build(cls):
+        """Build the index from the database."""
+        columns = [getattr(BannerModel, f) for f in SEARCH_FIELDS]
+        return cls(db.session.query(BannerModel.id, *columns))
+
+    def search(self, query):
+        """Return the ``(id, score)`` pairs of the matching banners, best first."""
+        query = query.lower()
+        trigrams = _trigrams(query)
+        if trigrams:
+            postings = sorted(
+                (self._postings.get(trigram, set()) for trigram in trigrams), key=len
+            )
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            candidates = self._documents.keys()
+
+        hits = []
+        for id_ in candidates:
+            score = max(
+                (
+                    len(query) / len(text)
+                    for text in self._documents[id_]
+                    if query in text
+                ),
+                default=0,
+            )
+            if score:
+                hits.append((id_, score))
+        hits.sort(key=lambda hit: (-hit[1], hit[0]))
+        return hits
+
+
+class TextIndexCache:
+    """Hold the in-process text index.
+
+    The index is dropped whenever a banner is written through this process,
+    and rebuilt after ``BANNERS_TEXT_INDEX_TTL`` seconds to pick up the writes
+    of other processes.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._index = None
+        self._expires_at = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _expired(self):
+        expires_at = self._expires_at
+        return expires_at is not None and time.monotonic() >= expires_at
+
+    @property
+    def index(self):
+        """Return the index, building it if needed."""
+        index = self._index
+        if index is None or self._expired():
+            with self._lock:
+                index = self._index
+                if index is None or self._expired():
+                    generation = self._generation
+                    ttl = current_app.config["BANNERS_TEXT_INDEX_TTL"]
+                    index = TrigramIndex.build()
+                    # keep it only if no write was committed while building
+                    if generation == self._generation:
+                        self._index = index
+                        self._expires_at = (
+                            time.monotonic() + ttl if ttl is not None else None
+                        )
+        return index
+
+    def invalidate(self):
+        """Drop the index."""
+        self._generation += 1
+        self._index = None
+
+
+text_hits = sa.Table(
+    "banners_text_hits",
+    sa.MetaData(),
+    sa.Column("key", sa.Integer, primary_key=True),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("score", sa.Float, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+"""Matches of the text index, joined by the queries of the transaction.
+
+The table is temporary, hence private to the database connection, and kept
+out of the metadata of the application.
+"""
+
+
+def _store_hits(hits):
+    """Load hits into :data:`text_hits`, return their key.
+
+    Each search of a transaction gets its own key, the rows of the previous
+    transactions of the connection are dropped.
+    """
+    session = db.session()
+    connection = session.connection()
+    transaction = session.get_transaction()
+    state = session.info.get("banners_text_hits")
+    if state is None or state[0] is not transaction:
+        text_hits.create(connection, checkfirst=True)
+        connection.execute(text_hits.delete())
+        state = [transaction, 0]
+        session.info["banners_text_hits"] = state
+    key = state[1]
+    state[1] += 1
+    session.execute(
+        text_hits.insert(),
+        [{"key": key, "id": id_, "score": score} for id_, score in hits],
+    )
+    return key
+
+
+def text_search(query):
+    """Return the predicate matching the query and the rank of the matches.
+
+    On PostgreSQL the ``ILIKE`` predicates are served by the trigram indexes
+    and ranked by trigram similarity. Other databases look the query up in
+    the in-process :class:`TrigramIndex` and join its matches from
+    :data:`text_hits`, so that the statement does not grow with them.
+    """
+    columns = [getattr(BannerModel, f) for f in SEARCH_FIELDS]
+    if db.engine.name == "postgresql":
+        pattern = f"%{escape_like(query)}%"
+        match = sa.or_(
+            *[column.ilike(pattern, escape=LIKE_ESCAPE) for column in columns]
+        )
+        rank = sa.func.greatest(
+            *[sa.func.similarity(sa.func.coalesce(c, ""), query) for c in columns]
+        )
+        return match, rank
+
+    hits = current_banners_text_index.index.search(query)
+    if not hits:
+        return sa.false(), sa.literal(0)
+    key = _store_hits(hits)
+    match = BannerModel.id.in_(sa.select(text_hits.c.id).where(text_hits.c.key == key))
+    score = (
+        sa.select(text_hits.c.score)
+        .where(text_hits.c.key == key, text_hits.c.id == BannerModel.id)
+        .scalar_subquery()
+    )
+    return match, sa.func.coalesce(score, 0)
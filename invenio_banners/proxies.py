@@ -17,3 +17,13 @@ current_banners_service = LocalProxy(
     lambda: current_app.extensions["invenio-banners"].banners_service
 )
 """Proxy for the currently instantiated banners service."""
+
+current_active_banners_cache = LocalProxy(
+    lambda: current_app.extensions["invenio-banners"].active_banners_cache
+)
+"""Proxy for the in-memory cache of active banners."""
+
+current_banners_text_index = LocalProxy(
+    lambda: current_app.extensions["invenio-banners"].text_index
+)
+"""Proxy for the in-process text index of the banners."""
@@ -7,17 +7,63 @@
 
 """Models."""
 
-from datetime import datetime
+import html
+import re
+from datetime import datetime, timedelta
 
 import sqlalchemy as sa
 from flask import current_app
 from invenio_db import db
-from sqlalchemy import or_
+from sqlalchemy.orm import load_only, query_expression, with_expression
 from sqlalchemy.orm.exc import NoResultFound
-from sqlalchemy.sql import text
 from sqlalchemy_utils.models import Timestamp
 
-from ..services.errors import BannerNotExistsError
+from .errors import BannerNotExistsError
+from .pagination import KeysetPage, OffsetPage
+
+URL_PATH_MAX_LENGTH = 255
+
+
+def url_path_prefixes(url_path):
+    """Return every prefix of the url path that a banner can be stored with.
+
+    A banner is shown on all the paths that start with its ``url_path``, so
+    matching it against the prefixes of the requested path with an equality
+    test is equivalent and lets the database use the ``url_path`` index.
+    """
+    url_path = url_path[:URL_PATH_MAX_LENGTH]
+    return [url_path[:i] for i in range(len(url_path) + 1)]
+
+
+_TAG_RE = re.compile(r"<[^>]*>?")
+_PARTIAL_ENTITY_RE = re.compile(r"&#?\w*$")
+
+MESSAGE_HEAD_FACTOR = 4
+"""Characters of the message read per character of its summary.
+
+Leaves room for the markup, which is stripped from the summary.
+"""
+
+
+def message_head_length(length):
+    """Return how much of a message to read for a summary of ``length``."""
+    return length * MESSAGE_HEAD_FACTOR
+
+
+def summarize_message(message, length, cut=False):
+    """Return the text of a message without its tags, cut to ``length``.
+
+    Entities are unescaped before cutting. ``cut`` tells that ``message`` is
+    only the beginning of the message, an unterminated tag or entity at its
+    end is dropped too.
+    """
+    text = _TAG_RE.sub(" ", message)
+    if cut:
+        text = _PARTIAL_ENTITY_RE.sub("", text)
+    text = " ".join(html.unescape(text).split())
+    if cut or len(text) > length:
+        return text[:length].rstrip() + "…"
+    return text
 
 
 class BannerModel(db.Model, Timestamp):
@@ -25,27 +71,57 @@ class BannerModel(db.Model, Timestamp):
 
     __tablename__ = "banners"
     __versioned__ = {"versioning": False}
+    __table_args__ = (
+        # active banners lookup
+        db.Index(
+            "ix_banners_active_start_datetime_end_datetime",
+            "active",
+            "start_datetime",
+            "end_datetime",
+        ),
+        # expired banners lookup, only active rows are of interest
+        db.Index(
+            "ix_banners_end_datetime_active",
+            "end_datetime",
+            postgresql_where=sa.column("active", sa.Boolean).is_(True),
+            sqlite_where=sa.column("active", sa.Boolean).is_(True),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
     message = db.Column(db.Text, nullable=False)
     """The message content."""
 
-    url_path = db.Column(db.String(255), nullable=True)
+    url_path = db.Column(db.String(URL_PATH_MAX_LENGTH), nullable=True, index=True)
     """Define in which URL /path the message will be visible."""
 
     category = db.Column(db.String(20), nullable=False)
     """Category of the message, for styling messages per category."""
 
-    start_datetime = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    start_datetime = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, index=True
+    )
     """Start date and time (UTC), can be immediate or delayed."""
 
-    end_datetime = db.Column(db.DateTime, nullable=True)
+    end_datetime = db.Column(db.DateTime, nullable=True, index=True)
     """End date and time (UTC), must be after `start` or forever if null."""
 
     active = db.Column(db.Boolean(name="active"), nullable=False, default=True)
     """Defines if the message is active, only one at the same time."""
 
+    _message_head = query_expression()
+    """Beginning of the message, when loaded instead of the whole message."""
+
+    @property
+    def message_summary(self):
+        """Text of the message without its tags, cut for list views."""
+        length = current_app.config["BANNERS_MESSAGE_SUMMARY_LENGTH"]
+        head = self._message_head
+        if head is None:
+            return summarize_message(self.message, length)
+        return summarize_message(head, length, len(head) > message_head_length(length))
+
     @classmethod
     def create(cls, data):
         """Create a new banner."""
@@ -65,6 +141,70 @@ class BannerModel(db.Model, Timestamp):
         db.session.commit()
         return obj
 
+    @classmethod
+    def create_many(cls, items):
+        """Create many banners in a single transaction."""
+        with db.session.begin_nested():
+            objs = [
+                cls(
+                    message=data.get("message"),
+                    category=data.get("category"),
+                    url_path=data.get("url_path"),
+                    start_datetime=data.get("start_datetime"),
+                    end_datetime=data.get("end_datetime"),
+                    active=data.get("active"),
+                )
+                for data in items
+            ]
+            db.session.add_all(objs)
+            db.session.flush()
+            ids = [obj.id for obj in objs]
+
+        db.session.commit()
+        return cls._reload(ids)
+
+    @classmethod
+    def insert_many(cls, items):
+        """Insert many banners with a single ``executemany``, without loading them.
+
+        Column defaults are applied as for ``create``, ids are assigned by the
+        database.
+        """
+        if not items:
+            return
+        rows = [
+            {
+                "message": data.get("message"),
+                "category": data.get("category"),
+                "url_path": data.get("url_path"),
+                "start_datetime": data.get("start_datetime"),
+                "end_datetime": data.get("end_datetime"),
+                "active": data.get("active"),
+            }
+            for data in items
+        ]
+        db.session.execute(sa.insert(cls), rows)
+        db.session.commit()
+
+    @classmethod
+    def update_many(cls, items):
+        """Update many banners, given as ``(banner, data)``, in one transaction."""
+        ids = []
+        with db.session.begin_nested():
+            for banner, data in items:
+                ids.append(banner.id)
+                for key, value in data.items():
+                    setattr(banner, key, value)
+
+        db.session.commit()
+        return cls._reload(ids)
+
+    @classmethod
+    def _reload(cls, ids):
+        """Reload banners expired by a commit with a single query, in order."""
+        banners = cls.get_many(ids)
+        return [banners[id_] for id_ in ids]
+
     @classmethod
     def update(cls, data, id):
         """Update an existing banner."""
@@ -81,6 +221,29 @@ class BannerModel(db.Model, Timestamp):
         except NoResultFound:
             raise BannerNotExistsError(id)
 
+    @classmethod
+    def get_many(cls, ids):
+        """Get the banners with the given ids, keyed by id."""
+        return {banner.id: banner for banner in cls.query.filter(cls.id.in_(ids))}
+
+    @classmethod
+    def iter_all(cls, batch_size):
+        """Iterate over all the banners by id, ``batch_size`` rows at a time.
+
+        The rows are streamed with a server-side cursor where the database
+        supports it, so that memory does not grow with the number of banners.
+        """
+        return cls.query.order_by(cls.id).yield_per(batch_size)
+
+    @classmethod
+    def delete_many(cls, banners):
+        """Delete many banners in a single transaction."""
+        with db.session.begin_nested():
+            for banner in banners:
+                db.session.delete(banner)
+
+        db.session.commit()
+
     @classmethod
     def delete(cls, banner):
         """Delete banner by its id."""
@@ -90,55 +253,168 @@ class BannerModel(db.Model, Timestamp):
         db.session.commit()
 
     @classmethod
-    def get_active(cls, url_path):
-        """Return active banners."""
-        now = datetime.utcnow()
-
-        query = (
+    def _active_query(cls, now):
+        """Return the query of banners active at the given time."""
+        return (
             cls.query.filter(cls.active.is_(True))
             .filter(cls.start_datetime <= now)
             .filter((cls.end_datetime.is_(None)) | (now <= cls.end_datetime))
         )
 
+    @classmethod
+    def get_active(cls, url_path):
+        """Return active banners."""
+        now = datetime.utcnow()
+
+        query = cls._active_query(now)
+
         # filter by url_path
         active_banners = query.filter(
             sa.or_(
                 cls.url_path.is_(None),
-                sa.literal(url_path).startswith(cls.url_path),
+                cls.url_path.in_(url_path_prefixes(url_path)),
             )
         )
 
         return active_banners.all()
 
+    @classmethod
+    def get_all_active(cls, now=None):
+        """Return active banners for any url path."""
+        now = now or datetime.utcnow()
+
+        return cls._active_query(now).order_by(cls.id).all()
+
+    @classmethod
+    def get_next_transition(cls, now=None):
+        """Return when the set of active banners changes next, if ever.
+
+        That is the first upcoming start of an active banner or the instant
+        right after the first upcoming end, whichever comes first.
+        """
+        now = now or datetime.utcnow()
+
+        next_start = (
+            db.session.query(sa.func.min(cls.start_datetime))
+            .filter(cls.active.is_(True))
+            .filter(cls.start_datetime > now)
+            .scalar_subquery()
+        )
+        next_end = (
+            db.session.query(sa.func.min(cls.end_datetime))
+            .filter(cls.active.is_(True))
+            .filter(cls.end_datetime.isnot(None))
+            .filter(cls.end_datetime >= now)
+            .scalar_subquery()
+        )
+        start, end = db.session.query(next_start, next_end).one()
+
+        # banners are shown until their end time included
+        if end is not None:
+            end += timedelta(microseconds=1)
+        transitions = [t for t in (start, end) if t is not None]
+        return min(transitions) if transitions else None
+
     @classmethod
     def search(cls, search_params, filters):
-        """Filter banners accordingly to query params."""
-        banners = (
-            BannerModel.query.filter(or_(*filters))
-            .order_by(
-                search_params["sort_direction"](text(",".join(search_params["sort"])))
-            )
-            .paginate(
-                page=search_params["page"],
-                per_page=search_params["size"],
-                error_out=False,
+        """Filter banners accordingly to query params, all filters must match."""
+        descending = search_params["sort_direction"] is sa.desc
+        # the id breaks ties so that the order (and the cursors) are stable
+        columns = [getattr(cls, field) for field in search_params["sort"]]
+        columns.append(cls.id)
+
+        query = BannerModel.query.filter(*filters)
+        fields = search_params.get("fields")
+        if fields:
+            # only load the selected columns, and the ones needed for sorting
+            loaded = [
+                column
+                for column in (getattr(cls, field, None) for field in fields)
+                if isinstance(column, sa.orm.InstrumentedAttribute)
+                and column.key in cls.__table__.columns
+            ]
+            query = query.options(load_only(*loaded, *columns))
+            if "message_summary" in fields:
+                length = current_app.config["BANNERS_MESSAGE_SUMMARY_LENGTH"]
+                # one more character tells whether the message was cut
+                head_length = message_head_length(length) + 1
+                head = sa.func.substr(cls.message, 1, head_length)
+                query = query.options(with_expression(cls._message_head, head))
+
+        if search_params.get("cursor") is not None:
+            return KeysetPage(
+                query,
+                columns,
+                search_params["size"],
+                cursor=search_params["cursor"],
+                descending=descending,
+                track_total=search_params.get("track_total", True),
             )
+
+        order_by = [search_params["sort_direction"](column) for column in columns]
+        if search_params.get("rank") is not None:
+            order_by.insert(0, sa.desc(search_params["rank"]))
+        query = query.order_by(*order_by)
+        if not search_params.get("track_total", True):
+            # skip the COUNT over all the matching banners
+            return OffsetPage(query, search_params["page"], search_params["size"])
+
+        banners = query.paginate(
+            page=search_params["page"],
+            per_page=search_params["size"],
+            error_out=False,
         )
 
         return banners
 
     @classmethod
-    def disable_expired(cls):
-        """Disable any old still active messages to keep everything clean."""
-        now = datetime.utcnow()
+    def disable_expired(cls, now=None):
+        """Disable any old still active messages, return their ids.
 
-        query = (
-            cls.query.filter(cls.active.is_(True))
-            .filter(cls.end_datetime.isnot(None))
-            .filter(cls.end_datetime < now)
+        The rows are flipped by a single ``UPDATE``, which returns their ids
+        directly on databases supporting ``RETURNING``.
+        """
+        now = now or datetime.utcnow()
+        expired = sa.and_(
+            cls.active.is_(True),
+            cls.end_datetime.isnot(None),
+            cls.end_datetime < now,
         )
 
-        for old in query.all():
-            old.active = False
+        if db.engine.dialect.full_returning:
+            statement = (
+                sa.update(cls)
+                .where(expired)
+                .values(active=False)
+                .returning(cls.id)
+                .execution_options(synchronize_session=False)
+            )
+            ids = [row.id for row in db.session.execute(statement)]
+        else:
+            ids = [row.id for row in db.session.query(cls.id).filter(expired)]
+            if ids:
+                cls.query.filter(cls.id.in_(ids)).update(
+                    {cls.active: False}, synchronize_session=False
+                )
 
         db.session.commit()
+        return ids
+
+
+TRIGRAM_INDEXED_COLUMNS = ("message", "url_path", "category")
+"""Columns with a trigram index serving the text search on PostgreSQL."""
+
+sa.event.listen(
+    BannerModel.__table__,
+    "after_create",
+    sa.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+for _column in TRIGRAM_INDEXED_COLUMNS:
+    sa.event.listen(
+        BannerModel.__table__,
+        "after_create",
+        sa.DDL(
+            f"CREATE INDEX ix_banners_{_column}_trgm ON banners "
+            f"USING gin ({_column} gin_trgm_ops)"
+        ).execute_if(dialect="postgresql"),
+    )
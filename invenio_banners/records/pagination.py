@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Keyset (seek) pagination."""
+
+import base64
+import json
+from datetime import datetime
+
+import sqlalchemy as sa
+from marshmallow import ValidationError
+
+
+def encode_cursor(values, before=False):
+    """Encode the sort key of a row into an opaque cursor."""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    payload = json.dumps({"k": values, "b": before}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_value(column, value):
+    """Check a sort key value against the type of its column."""
+    column = column.expression
+    if value is None:
+        if not column.nullable:
+            raise ValueError(value)
+        return value
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    # booleans are integers too
+    if type(value) is not python_type:
+        raise TypeError(value)
+    return value
+
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor into the sort key values and its direction."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values, before = payload["k"], bool(payload["b"])
+        if len(values) != len(columns):
+            raise ValueError(cursor)
+        values = [_decode_value(c, v) for c, v in zip(columns, values)]
+    except (ValueError, TypeError, KeyError):
+        raise ValidationError("Invalid cursor.", field_name="cursor")
+    return values, before
+
+
+def _seek(columns, values, descending, before):
+    """Build the predicate selecting the rows after (or before) the key.
+
+    Rows are ordered by ``columns`` with NULL values last, the last column
+    must be unique and not nullable.
+    """
+
+    def after(column, value):
+        return column < value if descending else column > value
+
+    def before_(column, value):
+        return column > value if descending else column < value
+
+    clauses = []
+    equal = []
+    for column, value in zip(columns, values):
+        if value is None:
+            # nothing comes after NULL, any value comes before it
+            strict = column.isnot(None) if before else None
+        elif before:
+            strict = before_(column, value)
+        else:
+            strict = sa.or_(after(column, value), column.is_(None))
+        if strict is not None:
+            clauses.append(sa.and_(*equal, strict))
+        equal.append(column.is_(None) if value is None else column == value)
+    return sa.or_(*clauses)
+
+
+def _order_by(columns, descending, before):
+    """Build the ordering of the rows, reversed when walking backwards."""
+    direction = sa.desc if descending != before else sa.asc
+    nulls = sa.nullsfirst if before else sa.nullslast
+    return [nulls(direction(column)) for column in columns]
+
+
+class KeysetPage:
+    """Page of rows selected with a seek predicate."""
+
+    def __init__(
+        self, query, columns, size, cursor=None, descending=False, track_total=True
+    ):
+        """Constructor."""
+        self._query = query
+        self._columns = columns
+        self._size = size
+        self._track_total = track_total
+        self._total = None
+
+        values, before = decode_cursor(cursor, columns) if cursor else (None, False)
+        if values is not None:
+            query = query.filter(_seek(columns, values, descending, before))
+        query = query.order_by(*_order_by(columns, descending, before))
+
+        items = query.limit(size + 1).all()
+        more = len(items) > size
+        items = items[:size]
+        if before:
+            items.reverse()
+        self.items = items
+
+        self.has_next = more if not before else True
+        self.has_prev = more if before else values is not None
+
+    def _cursor(self, item, before):
+        values = [getattr(item, column.key) for column in self._columns]
+        return encode_cursor(values, before=before)
+
+    @property
+    def next_cursor(self):
+        """Cursor of the page following this one."""
+        if self.items:
+            return self._cursor(self.items[-1], before=False)
+
+    @property
+    def prev_cursor(self):
+        """Cursor of the page preceding this one."""
+        if self.items:
+            return self._cursor(self.items[0], before=True)
+
+    @property
+    def total(self):
+        """Total number of rows matching the query, if tracked."""
+        if self._total is None and self._track_total:
+            self._total = self._query.order_by(None).count()
+        return self._total
+
+
+class OffsetPage:
+    """Page of rows selected with an offset, without counting all the rows."""
+
+    def __init__(self, query, page, size):
+        """Constructor."""
+        items = query.limit(size + 1).offset((page - 1) * size).all()
+        self.page = page
+        self.per_page = size
+        self.has_next = len(items) > size
+        self.has_prev = page > 1
+        self.items = items[:size]
+
+    @property
+    def total(self):
+        """Estimated number of rows, one more than seen when more pages exist.
+
+        It is exact on the last page and enough to tell that a next page
+        exists on the others.
+        """
+        seen = (self.page - 1) * self.per_page + len(self.items)
+        return seen + 1 if self.has_next else seen
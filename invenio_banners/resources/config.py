@@ -7,6 +7,8 @@
 
 """Banner Resource Configuration."""
 
+from datetime import date, datetime, time, timezone
+
 import marshmallow as ma
 from flask_resources import JSONDeserializer, RequestBodyParser
 from invenio_records_resources.resources import (
@@ -15,10 +17,36 @@ from invenio_records_resources.resources import (
 )
 
 
+class UTCDateTime(ma.fields.DateTime):
+    """Date or datetime, converted to a naive UTC datetime."""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        """Deserialize value, a date alone means its midnight."""
+        try:
+            return datetime.combine(date.fromisoformat(value), time.min)
+        except (TypeError, ValueError):
+            pass
+        value = super()._deserialize(value, attr, data, **kwargs)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class BannerServerSearchRequestArgsSchema(SearchRequestArgsSchema):
     """Banner request parameters."""
 
     sort_direction = ma.fields.Str()
+    cursor = ma.fields.Str()
+    track_total = ma.fields.Boolean()
+    fields = ma.fields.Str()
+    start_from = UTCDateTime()
+    start_to = UTCDateTime()
+    end_from = UTCDateTime()
+    end_to = UTCDateTime()
+    created_from = UTCDateTime()
+    created_to = UTCDateTime()
+    updated_from = UTCDateTime()
+    updated_to = UTCDateTime()
 
 
 class BannerResourceConfig(RecordResourceConfig):
@@ -30,6 +58,9 @@ class BannerResourceConfig(RecordResourceConfig):
     routes = {
         "item": "/<banner_id>",
         "list": "/",
+        "active": "/active",
+        "bulk": "/_bulk",
+        "export": "/_export",
     }
 
     request_view_args = {
@@ -39,6 +70,7 @@ class BannerResourceConfig(RecordResourceConfig):
     request_extra_args = {
         "active": ma.fields.Boolean(),
         "url_path": ma.fields.String(),
+        "format": ma.fields.String(validate=ma.validate.OneOf(["ndjson", "csv"])),
     }
 
     request_search_args = BannerServerSearchRequestArgsSchema
@@ -7,7 +7,9 @@
 
 """Errors."""
 
+import marshmallow as ma
 from flask_resources import HTTPJSONException, create_error_handler
+from invenio_records_resources.resources.errors import HTTPJSONValidationException
 
 from ..services.errors import BannerNotExistsError
 
@@ -16,6 +18,9 @@ class ErrorHandlersMixin:
     """Mixin to define error handlers."""
 
     error_handlers = {
+        ma.ValidationError: create_error_handler(
+            lambda e: HTTPJSONValidationException(e)
+        ),
         BannerNotExistsError: create_error_handler(
             lambda e: HTTPJSONException(
                 code=404,
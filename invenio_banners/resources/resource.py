@@ -7,15 +7,17 @@
 
 """Invenio Banners module to create REST APIs."""
 
-from flask import g
+from flask import current_app, g, request, stream_with_context
 from flask_resources import Resource, resource_requestctx, response_handler, route
 from invenio_records_resources.resources.records.resource import (
     request_data,
+    request_extra_args,
     request_headers,
     request_search_args,
     request_view_args,
 )
 
+from ..tasks import disable_expired_banners
 from .errors import ErrorHandlersMixin
 
 
@@ -37,8 +39,14 @@ class BannerResource(ErrorHandlersMixin, Resource):
             route("POST", routes["list"], self.create),
             route("GET", routes["item"], self.read),
             route("GET", routes["list"], self.search),
+            route("GET", routes["active"], self.read_active),
+            route("POST", routes["active"], self.read_active_many),
             route("DELETE", routes["item"], self.delete),
             route("PUT", routes["item"], self.update),
+            route("POST", routes["bulk"], self.create_many),
+            route("PUT", routes["bulk"], self.update_many),
+            route("DELETE", routes["bulk"], self.delete_many),
+            route("GET", routes["export"], self.export),
         ]
 
     @request_view_args
@@ -52,8 +60,8 @@ class BannerResource(ErrorHandlersMixin, Resource):
             data=resource_requestctx.data,
         )
 
-        # disable expired banners
-        self.service.disable_expired(identity=g.identity)
+        # disable expired banners, off the request path
+        disable_expired_banners.delay()
 
         return banner.to_dict(), 200
 
@@ -69,6 +77,37 @@ class BannerResource(ErrorHandlersMixin, Resource):
 
         return banner.to_dict(), 200
 
+    @request_extra_args
+    def read_active(self):
+        """Read the banners active for a url path."""
+        banners = self.service.read_active(
+            identity=g.identity,
+            url_path=resource_requestctx.args.get("url_path", ""),
+        )
+
+        # weak comparison, as proxies compressing the response weaken the tag
+        if request.if_none_match.contains_weak(banners.etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = resource_requestctx.response_handler.make_response(
+                banners.to_dict(), 200
+            )
+        response.set_etag(banners.etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = banners.max_age
+        return response
+
+    @request_data
+    @response_handler()
+    def read_active_many(self):
+        """Read the banners active for each url path of the request body."""
+        banners = self.service.read_active_many(
+            g.identity,
+            resource_requestctx.data or {},
+        )
+
+        return banners.to_dict(), 200
+
     @request_search_args
     @response_handler(many=True)
     def search(self):
@@ -89,11 +128,65 @@ class BannerResource(ErrorHandlersMixin, Resource):
             resource_requestctx.data or {},
         )
 
-        # disable expired banners
-        self.service.disable_expired(identity=g.identity)
+        # disable expired banners, off the request path
+        disable_expired_banners.delay()
 
         return banner.to_dict(), 201
 
+    @request_data
+    @response_handler()
+    def create_many(self):
+        """Create many banners at once."""
+        result = self.service.create_many(
+            g.identity,
+            resource_requestctx.data or [],
+        )
+
+        # disable expired banners, off the request path
+        disable_expired_banners.delay()
+
+        return result.to_dict(), 200
+
+    @request_data
+    @response_handler()
+    def update_many(self):
+        """Update many banners at once."""
+        result = self.service.update_many(
+            g.identity,
+            resource_requestctx.data or [],
+        )
+
+        # disable expired banners, off the request path
+        disable_expired_banners.delay()
+
+        return result.to_dict(), 200
+
+    @request_data
+    @response_handler()
+    def delete_many(self):
+        """Delete many banners at once."""
+        result = self.service.delete_many(
+            g.identity,
+            resource_requestctx.data or {},
+        )
+
+        return result.to_dict(), 200
+
+    @request_extra_args
+    def export(self):
+        """Stream an export of all the banners, as NDJSON or CSV."""
+        format = resource_requestctx.args.get("format", "ndjson")
+        export = self.service.export(g.identity)
+
+        response = current_app.response_class(
+            stream_with_context(export.serialize(format)),
+            mimetype=export.mimetypes[format],
+        )
+        response.headers[
+            "Content-Disposition"
+        ] = f"attachment; filename=banners.{format}"
+        return response
+
     @request_headers
     @request_view_args
     def delete(self):
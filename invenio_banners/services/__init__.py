@@ -8,7 +8,14 @@
 """Banners Service API."""
 
 from .config import BannerServiceConfig, BannersLink
-from .results import BannerItem, BannerList
+from .results import (
+    ActiveBannerList,
+    ActiveBannerMap,
+    BannerBulkList,
+    BannerExport,
+    BannerItem,
+    BannerList,
+)
 from .service import BannerService
 
 __all__ = (
@@ -16,5 +23,9 @@ __all__ = (
     "BannerServiceConfig",
     "BannerList",
     "BannerItem",
+    "ActiveBannerList",
+    "ActiveBannerMap",
+    "BannerBulkList",
+    "BannerExport",
     "BannersLink",
 )
@@ -7,15 +7,32 @@
 
 """Banners Service configuration."""
 
+from copy import deepcopy
+from urllib.parse import quote
+from uuid import uuid4
+
 from invenio_i18n import gettext as _
 from invenio_records_resources.services import Link, RecordServiceConfig
+from invenio_records_resources.services.base.links import preprocess_vars
 from invenio_records_resources.services.records.links import pagination_links
 from sqlalchemy import asc, desc
 
 from ..records.models import BannerModel
 from .permissions import BannersPermissionPolicy
-from .results import BannerItem, BannerList
-from .schemas import BannerSchema
+from .results import (
+    ActiveBannerList,
+    ActiveBannerMap,
+    BannerBulkList,
+    BannerExport,
+    BannerItem,
+    BannerList,
+)
+from .schemas import (
+    ActiveBannersLookupSchema,
+    BannersBulkDeleteSchema,
+    BannerSchema,
+    BannerSummarySchema,
+)
 
 
 class BannersLink(Link):
@@ -26,6 +43,40 @@ class BannersLink(Link):
         """Variables for the URI template."""
         vars.update({"id": banner.id})
 
+    def compile(self, context):
+        """Expand the template once for a context, leaving only the id to fill.
+
+        Returns a function of a banner, or ``None`` when the link has custom
+        conditions or variables and must be expanded per banner.
+        """
+        if self._when_func or self._vars_func:
+            return None
+        marker = uuid4().hex
+        vars = deepcopy(context)
+        vars["id"] = marker
+        parts = self._uritemplate.expand(**preprocess_vars(vars)).split(marker)
+        if len(parts) != 2:
+            return None
+        prefix, suffix = parts
+        return lambda banner: prefix + quote(str(banner.id), safe="") + suffix
+
+
+def keyset_pagination_links(tpl):
+    """Create cursor based pagination links (prev/self/next)."""
+    return {
+        "prev": Link(
+            tpl,
+            when=lambda page, ctx: page.has_prev,
+            vars=lambda page, vars: vars["args"].update({"cursor": page.prev_cursor}),
+        ),
+        "self": Link(tpl),
+        "next": Link(
+            tpl,
+            when=lambda page, ctx: page.has_next,
+            vars=lambda page, vars: vars["args"].update({"cursor": page.next_cursor}),
+        ),
+    }
+
 
 class SearchOptions:
     """Search options."""
@@ -44,6 +95,10 @@ class SearchOptions:
 
     sort_default = "start_datetime"
     sort_options = {
+        "bestmatch": dict(
+            title=_("Best match"),
+            fields=[],
+        ),
         "url_path": dict(
             title=_("Url path"),
             fields=["url_path"],
@@ -64,6 +119,7 @@ class SearchOptions:
     pagination_options = {
         "default_results_per_page": 25,
     }
+    track_total_default = True
 
 
 class BannerServiceConfig(RecordServiceConfig):
@@ -71,8 +127,15 @@ class BannerServiceConfig(RecordServiceConfig):
 
     result_item_cls = BannerItem
     result_list_cls = BannerList
+    result_active_cls = ActiveBannerList
+    result_active_map_cls = ActiveBannerMap
+    result_bulk_cls = BannerBulkList
+    result_export_cls = BannerExport
     permission_policy_cls = BannersPermissionPolicy
     schema = BannerSchema
+    schema_active_lookup = ActiveBannersLookupSchema
+    schema_bulk_delete = BannersBulkDeleteSchema
+    schema_summary = BannerSummarySchema
 
     # Search configuration
     search = SearchOptions
@@ -82,4 +145,5 @@ class BannerServiceConfig(RecordServiceConfig):
         "self": BannersLink("{+api}/banners/{id}"),
     }
     links_search = pagination_links("{+api}/banners{?args*}")
+    links_search_keyset = keyset_pagination_links("{+api}/banners{?args*}")
     record_cls = BannerModel
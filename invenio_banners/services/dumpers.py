@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Precompiled dumpers of banner models."""
+
+from functools import lru_cache
+
+from marshmallow import fields
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow_utils.fields import Links, TZDateTime
+
+
+def _tz_datetime(field):
+    tz = field.timezone
+    return lambda value: value.replace(tzinfo=tz).isoformat()
+
+
+def _datetime(field):
+    return lambda value: value.isoformat()
+
+
+# most specific classes first, only the exact field classes are compiled
+_CONVERTERS = {
+    TZDateTime: _tz_datetime,
+    fields.DateTime: _datetime,
+    fields.String: lambda field: str,
+    fields.Integer: lambda field: int,
+    fields.Boolean: lambda field: bool,
+}
+
+
+def _has_dump_hooks(schema_cls):
+    """Return whether the schema declares ``pre_dump`` or ``post_dump`` hooks.
+
+    Hooks are keyed by tag, or by ``(tag, many)`` before marshmallow 3.22.
+    """
+    for name in dir(schema_cls):
+        hooks = getattr(getattr(schema_cls, name, None), "__marshmallow_hook__", None)
+        for key in hooks or ():
+            tag = key[0] if isinstance(key, tuple) else key
+            if tag in (PRE_DUMP, POST_DUMP):
+                return True
+    return False
+
+
+def _converter(field):
+    """Return the function serializing a non-null value of the field, if any."""
+    factory = _CONVERTERS.get(type(field))
+    if factory is None:
+        return None
+    if isinstance(field, fields.DateTime) and field.format not in (None, "iso"):
+        return None
+    if isinstance(field, fields.Number) and field.as_string:
+        return None
+    return factory(field)
+
+
+@lru_cache(maxsize=None)
+def compile_dumper(schema_cls, model_cls, only=None):
+    """Compile a function dumping a model like ``schema_cls(only=only).dump``.
+
+    The generated function reads every column once and builds the output dict
+    in the order of the schema fields. Attributes that the model does not
+    have are left out, as marshmallow does. Returns ``None`` when the schema
+    has dump hooks or fields that cannot be compiled.
+    """
+    if _has_dump_hooks(schema_cls):
+        return None
+    schema = schema_cls(only=only)
+
+    namespace = {}
+    lines = []
+    items = []
+    for name, field in schema.dump_fields.items():
+        key = field.data_key if field.data_key is not None else name
+        if type(field) is Links:
+            # without a links factory in the context links dump empty
+            items.append(f"        {key!r}: {{}},\n")
+            continue
+        attribute = field.attribute or name
+        if not attribute.isidentifier() or not hasattr(model_cls, attribute):
+            continue
+        convert = _converter(field)
+        if convert is None:
+            return None
+        i = len(lines)
+        namespace[f"convert_{i}"] = convert
+        lines.append(f"    value_{i} = obj.{attribute}\n")
+        items.append(
+            f"        {key!r}: None if value_{i} is None else convert_{i}(value_{i}),\n"
+        )
+
+    source = "def dump(obj):\n" + "".join(lines) + "    return {\n"
+    source += "".join(items) + "    }\n"
+    exec(compile(source, f"<dumper {schema_cls.__name__}>", "exec"), namespace)
+    return namespace["dump"]
@@ -7,15 +7,7 @@
 
 """Errors."""
 
+# raised by the model, which must not depend on the services
+from ..records.errors import BannerNotExistsError
 
-class BannerNotExistsError(Exception):
-    """Banner not found exception."""
-
-    def __init__(self, banner_id):
-        """Constructor."""
-        self.banner_id = banner_id
-
-    @property
-    def description(self):
-        """Exception's description."""
-        return f"Banner with id {self.banner_id} is not found."
+__all__ = ("BannerNotExistsError",)
@@ -7,9 +7,11 @@
 
 """Banners permissions."""
 
+from functools import lru_cache
+
 from invenio_administration.generators import Administration
 from invenio_records_permissions import BasePermissionPolicy
-from invenio_records_permissions.generators import AnyUser, SystemProcess
+from invenio_records_permissions.generators import AnyUser, Generator, SystemProcess
 
 
 class BannersPermissionPolicy(BasePermissionPolicy):
@@ -21,3 +23,26 @@ class BannersPermissionPolicy(BasePermissionPolicy):
     can_update = [Administration(), SystemProcess()]
     can_delete = [Administration(), SystemProcess()]
     can_disable = [Administration(), SystemProcess()]
+    can_export = [Administration(), SystemProcess()]
+
+
+@lru_cache(maxsize=None)
+def public_actions(policy_cls):
+    """Return the actions of a policy that are granted to any user.
+
+    An action is public when one of its generators is exactly ``AnyUser`` and
+    none of them can exclude needs, so that any identity providing the
+    ``any_user`` need is allowed without evaluating the policy.
+    """
+    actions = set()
+    for name in dir(policy_cls):
+        if not name.startswith("can_"):
+            continue
+        generators = getattr(policy_cls, name)
+        if not isinstance(generators, (list, tuple)):
+            continue
+        if any(type(g).excludes is not Generator.excludes for g in generators):
+            continue
+        if any(type(g) is AnyUser for g in generators):
+            actions.add(name[len("can_") :])
+    return frozenset(actions)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Banner search query syntax.
+
+A query is a list of whitespace separated terms, all of which must match::
+
+    maintenance category:warning active:true start:>=2024-01-01 path:/records
+
+Terms without a known field are matched against the text of the banners,
+double quotes keep spaces in a value (``message:"planned downtime"``).
+"""
+
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+import sqlalchemy as sa
+from marshmallow import ValidationError
+
+from ..fulltext import LIKE_ESCAPE, escape_like, text_search
+from ..records.models import BannerModel
+
+Term = namedtuple("Term", ["field", "op", "value"])
+"""Parsed query term, ``field`` is ``None`` for free text."""
+
+FIELDS = {
+    "active": "active",
+    "category": "category",
+    "created": "created",
+    "end": "end_datetime",
+    "message": "message",
+    "path": "url_path",
+    "start": "start_datetime",
+    "updated": "updated",
+    "url_path": "url_path",
+}
+"""Query fields and the banner columns they target."""
+
+DATE_FIELDS = {"created", "end_datetime", "start_datetime", "updated"}
+
+_TERM_RE = re.compile(r'(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+_OP_RE = re.compile(r"(>=|<=|>|<)?(.*)")
+_DAY_RE = re.compile(r"\d{4}-\d{1,2}-\d{1,2}$")
+_BOOLEANS = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+}
+
+
+def _invalid(message):
+    return ValidationError(message, field_name="q")
+
+
+def _parse_bool(value):
+    try:
+        return _BOOLEANS[value.lower()]
+    except KeyError:
+        raise _invalid(f"Invalid boolean value: {value}.")
+
+
+def _parse_date(value):
+    """Parse a date or datetime, return it and whether it is a whole day."""
+    if _DAY_RE.match(value):
+        year, month, day = (int(part) for part in value.split("-"))
+        try:
+            return datetime(year, month, day), True
+        except ValueError:
+            raise _invalid(f"Invalid date: {value}.")
+    try:
+        value = datetime.fromisoformat(value)
+    except ValueError:
+        raise _invalid(f"Invalid date: {value}.")
+    if value.tzinfo is not None:
+        # banners are stored in naive UTC
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value, False
+
+
+@lru_cache(maxsize=1024)
+def parse_query(query):
+    """Parse a query string into a tuple of terms, cached per query string."""
+    terms = []
+    for match in _TERM_RE.finditer(query):
+        name, quoted, bare = match.groups()
+        value = quoted if quoted is not None else bare
+        field = FIELDS.get(name.lower()) if name else None
+        if field is None:
+            # unknown fields are plain text, e.g. ``https://...``
+            terms.append(Term(None, None, f"{name}:{value}" if name else value))
+        elif field == "active":
+            terms.append(Term(field, "=", _parse_bool(value)))
+        elif field in DATE_FIELDS:
+            op, value = _OP_RE.match(value).groups()
+            terms.append(Term(field, op or "=", _parse_date(value)))
+        elif field == "category":
+            terms.append(Term(field, "=", value.lower()))
+        else:
+            terms.append(Term(field, "=", value))
+    return tuple(terms)
+
+
+def _date_predicate(column, op, value):
+    """Compile a date comparison to a sargable, half-open range."""
+    value, whole_day = value
+    if not whole_day:
+        return {
+            "=": column == value,
+            ">": column > value,
+            ">=": column >= value,
+            "<": column < value,
+            "<=": column <= value,
+        }[op]
+    next_day = value + timedelta(days=1)
+    return {
+        "=": sa.and_(column >= value, column < next_day),
+        ">": column >= next_day,
+        ">=": column >= value,
+        "<": column < value,
+        "<=": column < next_day,
+    }[op]
+
+
+def _free_text(value):
+    """Match the text of the banners, and the typed columns for literals."""
+    match, rank = text_search(value)
+    alternatives = [match]
+    if value.lower() in ("true", "false"):
+        alternatives.append(BannerModel.active.is_(_BOOLEANS[value.lower()]))
+    if _DAY_RE.match(value):
+        try:
+            day = _parse_date(value)
+        except ValidationError:
+            pass
+        else:
+            alternatives.extend(
+                _date_predicate(getattr(BannerModel, field), "=", day)
+                for field in ("start_datetime", "end_datetime")
+            )
+    return sa.or_(*alternatives), rank
+
+
+DATE_RANGES = {
+    "start": "start_datetime",
+    "end": "end_datetime",
+    "created": "created",
+    "updated": "updated",
+}
+"""Date range search parameters prefixes and the banner columns they target."""
+
+
+def date_range_predicates(params):
+    """Compile the ``<field>_from``/``<field>_to`` parameters to predicates.
+
+    Ranges are half-open, ``_from`` is inclusive and ``_to`` exclusive, and
+    compare the raw columns so that their indexes can be used.
+    """
+    predicates = []
+    for prefix, field in DATE_RANGES.items():
+        column = getattr(BannerModel, field)
+        lower = params.get(f"{prefix}_from")
+        upper = params.get(f"{prefix}_to")
+        if lower is not None:
+            predicates.append(column >= lower)
+        if upper is not None:
+            predicates.append(column < upper)
+    return predicates
+
+
+def compile_query(query):
+    """Compile a query string into a predicate and the rank of the matches.
+
+    The rank is ``None`` when the query has no free text.
+    """
+    predicates = []
+    ranks = []
+    for term in parse_query(query):
+        if term.field is None:
+            predicate, rank = _free_text(term.value)
+            ranks.append(rank)
+        else:
+            column = getattr(BannerModel, term.field)
+            if term.field == "active":
+                predicate = column.is_(term.value)
+            elif term.field in DATE_FIELDS:
+                predicate = _date_predicate(column, term.op, term.value)
+            elif term.field == "url_path":
+                predicate = column.startswith(term.value, autoescape=True)
+            elif term.field == "message":
+                pattern = f"%{escape_like(term.value)}%"
+                predicate = column.ilike(pattern, escape=LIKE_ESCAPE)
+            else:
+                predicate = column == term.value
+        predicates.append(predicate)
+
+    if not predicates:
+        return sa.true(), None
+    rank = sum(ranks[1:], ranks[0]) if ranks else None
+    return sa.and_(*predicates), rank
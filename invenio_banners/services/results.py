@@ -6,9 +6,45 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Service results."""
+import csv
+import io
+import json
+from copy import deepcopy
+from datetime import datetime
+from itertools import islice
+
+from flask import current_app
 from flask_sqlalchemy import Pagination
 from invenio_records_resources.services.records.results import RecordItem, RecordList
 
+from ..records.pagination import KeysetPage, OffsetPage
+from .dumpers import compile_dumper
+
+
+def _compiled_dumper(schema_cls, model_cls, only=None):
+    """Return the compiled dumper of a schema, if enabled and possible."""
+    if not current_app.config["BANNERS_COMPILED_DUMPER"]:
+        return None
+    return compile_dumper(schema_cls, model_cls, only)
+
+
+def _compiled_links(links_tpl, identity):
+    """Return a function expanding the links of a template for many banners.
+
+    Links that can be compiled resolve the context of the template once, the
+    others are expanded per banner.
+    """
+    context = deepcopy(links_tpl.context)
+    context["identity"] = identity
+    compiled = {}
+    for key, link in links_tpl._links.items():
+        compile_link = getattr(link, "compile", None)
+        expand = compile_link(context) if compile_link else None
+        if expand is None:
+            return lambda banner: links_tpl.expand(identity, banner)
+        compiled[key] = expand
+    return lambda banner: {key: expand(banner) for key, expand in compiled.items()}
+
 
 class BannerItem(RecordItem):
     """Single banner result."""
@@ -31,13 +67,17 @@ class BannerItem(RecordItem):
         if self._data:
             return self._data
 
-        self._data = self._schema.dump(
-            self._obj,
-            context={
-                "identity": self._identity,
-                "record": self._record,
-            },
-        )
+        dump = _compiled_dumper(self._schema.schema, type(self._obj))
+        if dump is not None:
+            self._data = dump(self._obj)
+        else:
+            self._data = self._schema.dump(
+                self._obj,
+                context={
+                    "identity": self._identity,
+                    "record": self._record,
+                },
+            )
 
         if self._links_tpl:
             self._data["links"] = self.links
@@ -66,21 +106,35 @@ class BannerList(RecordList):
     @property
     def hits(self):
         """Iterator over the hits."""
+        fields = (self._params or {}).get("fields")
+        if fields:
+            # sparse fieldset, only the selected columns were loaded
+            schema_cls = self._service.config.schema_summary
+            dump = _compiled_dumper(schema_cls, self._service.record_cls, fields)
+            if dump is None:
+                schema = schema_cls(only=fields, context={"identity": self._identity})
+                dump = schema.dump
+        else:
+            dump = _compiled_dumper(self._schema.schema, self._service.record_cls)
+        links = None
+        if self._links_item_tpl:
+            links = _compiled_links(self._links_item_tpl, self._identity)
         for record in self.banners_result():
             # Project the record
-            projection = self._schema.dump(
-                record,
-                context=dict(
-                    identity=self._identity,
-                    record=record,
-                ),
-            )
-
-            if self._links_item_tpl:
-                projection["links"] = self._links_item_tpl.expand(
-                    self._identity, record
+            if dump is not None:
+                projection = dump(record)
+            else:
+                projection = self._schema.dump(
+                    record,
+                    context=dict(
+                        identity=self._identity,
+                        record=record,
+                    ),
                 )
 
+            if links is not None:
+                projection["links"] = links(record)
+
             yield projection
 
     def to_dict(self):
@@ -103,14 +157,212 @@ class BannerList(RecordList):
         """Get total number of banners."""
         return (
             self._results.total
-            if isinstance(self._results, Pagination)
+            if isinstance(self._results, (Pagination, KeysetPage, OffsetPage))
             else len(self._results)
         )
 
+    @property
+    def pagination(self):
+        """Create a pagination object."""
+        if isinstance(self._results, KeysetPage):
+            return self._results
+        return super().pagination
+
     def banners_result(self):
         """Get iterable banners list."""
         return (
             self._results.items
-            if isinstance(self._results, Pagination)
+            if isinstance(self._results, (Pagination, KeysetPage, OffsetPage))
             else self._results
         )
+
+
+def _dump_active_banner(banner):
+    """Compact projection of an active banner."""
+    return {
+        "id": banner.id,
+        "message": banner.message,
+        "url_path": banner.url_path,
+        "category": banner.category,
+        "start_datetime": banner.start_datetime.isoformat(),
+        "end_datetime": (
+            banner.end_datetime.isoformat() if banner.end_datetime else None
+        ),
+    }
+
+
+class ActiveBannerList:
+    """Banners active for a url path, taken from the active banners snapshot."""
+
+    def __init__(self, service, identity, snapshot, url_path, max_age=None):
+        """Constructor."""
+        self._service = service
+        self._identity = identity
+        self._snapshot = snapshot
+        self._url_path = url_path
+        self._max_age = max_age
+
+    @property
+    def etag(self):
+        """Strong entity tag, changing whenever any active banner changes."""
+        return self._snapshot.version
+
+    @property
+    def max_age(self):
+        """Seconds the result can be cached, until the next schedule change."""
+        max_age = self._max_age
+        valid_until = self._snapshot.valid_until
+        if valid_until is not None:
+            remaining = int((valid_until - datetime.utcnow()).total_seconds())
+            remaining = max(remaining, 0)
+            max_age = remaining if max_age is None else min(max_age, remaining)
+        return max_age
+
+    @property
+    def hits(self):
+        """Iterator over the hits."""
+        for banner in self._snapshot.resolve(self._url_path):
+            yield _dump_active_banner(banner)
+
+    def to_dict(self):
+        """Return result as a dictionary."""
+        hits = list(self.hits)
+        return {
+            "hits": {
+                "hits": hits,
+                "total": len(hits),
+            }
+        }
+
+
+class ActiveBannerMap:
+    """Banners active for many url paths, taken from the same snapshot."""
+
+    def __init__(self, service, identity, snapshot, url_paths):
+        """Constructor."""
+        self._service = service
+        self._identity = identity
+        self._snapshot = snapshot
+        self._url_paths = url_paths
+
+    def __getitem__(self, url_path):
+        """Return the hits of a url path."""
+        return [
+            _dump_active_banner(banner) for banner in self._snapshot.resolve(url_path)
+        ]
+
+    def to_dict(self):
+        """Return result as a dictionary."""
+        return {
+            "hits": {url_path: self[url_path] for url_path in self._url_paths},
+        }
+
+
+class BannerBulkList:
+    """Outcome of a bulk operation: the banners written and per-item errors."""
+
+    def __init__(self, service, identity, banners, errors, links_tpl=None):
+        """Constructor.
+
+        ``banners`` are models, or ids when they were deleted.
+        """
+        self._service = service
+        self._identity = identity
+        self._banners = banners
+        self._errors = errors
+        self._links_tpl = links_tpl
+
+    @property
+    def errors(self):
+        """Errors of the items that were not written, with their index."""
+        return self._errors
+
+    @property
+    def hits(self):
+        """Iterator over the written banners."""
+        for banner in self._banners:
+            if isinstance(banner, int):
+                yield {"id": str(banner)}
+                continue
+            yield self._service.result_item(
+                self._service, self._identity, banner, links_tpl=self._links_tpl
+            ).to_dict()
+
+    def to_dict(self):
+        """Return result as a dictionary."""
+        hits = list(self.hits)
+        return {
+            "hits": {
+                "hits": hits,
+                "total": len(hits),
+            },
+            "errors": self._errors,
+        }
+
+
+class BannerExport:
+    """Export of all the banners, serialized one batch of rows at a time."""
+
+    mimetypes = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    def __init__(self, service, identity, banners, batch_size):
+        """Constructor.
+
+        ``banners`` is an iterator over the banners, consumed only once.
+        """
+        self._service = service
+        self._identity = identity
+        self._banners = banners
+        self._batch_size = batch_size
+        self._schema_cls = service.config.schema
+
+    @property
+    def fields(self):
+        """Keys of the exported banners, in the schema order."""
+        model_cls = self._service.record_cls
+        return [
+            field.data_key or name
+            for name, field in self._schema_cls().dump_fields.items()
+            if name != "links" and hasattr(model_cls, field.attribute or name)
+        ]
+
+    def _batches(self):
+        """Iterate over lists of dumped banners."""
+        model_cls = self._service.record_cls
+        dump = _compiled_dumper(self._schema_cls, model_cls)
+        if dump is None:
+            dump = self._schema_cls(context={"identity": self._identity}).dump
+        banners = iter(self._banners)
+        while True:
+            batch = [dump(banner) for banner in islice(banners, self._batch_size)]
+            if not batch:
+                return
+            for data in batch:
+                data.pop("links", None)
+            yield batch
+
+    def ndjson(self):
+        """Iterate over chunks of newline delimited JSON."""
+        for batch in self._batches():
+            yield "".join(json.dumps(data) + "\n" for data in batch)
+
+    def csv(self):
+        """Iterate over chunks of CSV, starting with the header."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, self.fields, extrasaction="ignore")
+        writer.writeheader()
+        for batch in self._batches():
+            writer.writerows(batch)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            # no banners, only the header
+            yield buffer.getvalue()
+
+    def serialize(self, format):
+        """Iterate over the chunks of the export in the given format."""
+        return getattr(self, format)()
@@ -10,7 +10,7 @@
 from datetime import datetime, timezone
 
 from invenio_records_resources.services.records.schema import BaseRecordSchema
-from marshmallow import fields
+from marshmallow import Schema, fields
 from marshmallow_utils.fields import TZDateTime
 
 
@@ -28,3 +28,21 @@ class BannerSchema(BaseRecordSchema):
     active = fields.Boolean(required=True, metadata={"default": True})
     created = TZDateTime(timezone=timezone.utc, format="iso", dump_only=True)
     updated = TZDateTime(timezone=timezone.utc, format="iso", dump_only=True)
+
+
+class BannerSummarySchema(BannerSchema):
+    """Schema for banners in list views, with a summary of their message."""
+
+    message_summary = fields.String(dump_only=True)
+
+
+class ActiveBannersLookupSchema(Schema):
+    """Schema for looking up the active banners of many url paths."""
+
+    url_paths = fields.List(fields.String(), required=True)
+
+
+class BannersBulkDeleteSchema(Schema):
+    """Schema for deleting many banners at once."""
+
+    ids = fields.List(fields.Integer(), required=True)
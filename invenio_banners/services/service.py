@@ -7,20 +7,53 @@
 
 """Banner Service API."""
 
-import distutils.util
+from operator import itemgetter
 
-import arrow
+from flask import current_app, g, has_request_context, request
+from invenio_access.permissions import any_user
+from invenio_records_resources.errors import validation_error_to_list_errors
 from invenio_records_resources.services import RecordService
 from invenio_records_resources.services.base import LinksTemplate
 from invenio_records_resources.services.base.utils import map_search_params
-from sqlalchemy import func
+from marshmallow import ValidationError
 
+from ..proxies import current_active_banners_cache
 from ..records.models import BannerModel
+from .errors import BannerNotExistsError
+from .permissions import public_actions
+from .query import compile_query, date_range_predicates
 
 
 class BannerService(RecordService):
     """Banner Service."""
 
+    def check_permission(self, identity, action_name, **kwargs):
+        """Check a permission against the identity.
+
+        Public actions are allowed without building the policy. Other checks
+        without arguments are cached per identity for the current request.
+        """
+        if kwargs:
+            return super().check_permission(identity, action_name, **kwargs)
+        policy_cls = self.config.permission_policy_cls
+        if action_name in public_actions(policy_cls) and any_user in identity.provides:
+            return True
+        if not has_request_context():
+            return super().check_permission(identity, action_name)
+
+        # the application context, hence ``g``, can outlive the request
+        current_request = request._get_current_object()
+        owner, cache = g.get("_banners_permissions", (None, None))
+        if owner is not current_request:
+            cache = {}
+            g._banners_permissions = (current_request, cache)
+        key = (action_name, id(identity))
+        cached = cache.get(key)
+        if cached is None or cached[0] is not identity:
+            allowed = super().check_permission(identity, action_name)
+            cached = cache[key] = (identity, allowed)
+        return cached[1]
+
     def read(self, identity, id):
         """Retrieve a banner."""
         self.require_permission(identity, "read")
@@ -34,53 +67,101 @@ class BannerService(RecordService):
             links_tpl=self.links_item_tpl,
         )
 
+    def read_active(self, identity, url_path):
+        """Retrieve the banners active for a url path."""
+        self.require_permission(identity, "read")
+
+        return self.config.result_active_cls(
+            self,
+            identity,
+            current_active_banners_cache.snapshot,
+            url_path,
+            max_age=current_app.config["BANNERS_ACTIVE_MAX_AGE"],
+        )
+
+    def read_active_many(self, identity, data):
+        """Retrieve the banners active for each of the given url paths."""
+        self.require_permission(identity, "read")
+
+        data = self.config.schema_active_lookup().load(data)
+        url_paths = data["url_paths"]
+        max_url_paths = current_app.config["BANNERS_ACTIVE_MAX_URL_PATHS"]
+        if len(url_paths) > max_url_paths:
+            raise ValidationError(
+                f"At most {max_url_paths} url paths can be looked up at once.",
+                field_name="url_paths",
+            )
+
+        return self.config.result_active_map_cls(
+            self,
+            identity,
+            current_active_banners_cache.snapshot,
+            url_paths,
+        )
+
     def search(self, identity, params):
         """Search for banners matching the querystring."""
         self.require_permission(identity, "search")
 
         search_params = map_search_params(self.config.search, params)
+        search_params["cursor"] = params.get("cursor")
+        search_params["track_total"] = params.get(
+            "track_total", self.config.search.track_total_default
+        )
 
         query_param = search_params["q"]
         filters = []
 
         if query_param:
-            filters.extend(
-                [
-                    BannerModel.url_path.ilike(f"%{query_param}%"),
-                    BannerModel.message.ilike(f"%{query_param}%"),
-                    BannerModel.category.ilike(f"%{query_param}%"),
-                ]
-            )
-            bool_value = self._validate_bool(query_param)
-            if bool_value is not None:
-                filters.extend(
-                    [
-                        BannerModel.active.is_(bool_value),
-                    ]
-                )
-
-            datetime_value = self._validate_datetime(query_param)
-            if datetime_value is not None:
-                filters.extend(
-                    [
-                        func.date(BannerModel.start_datetime) == datetime_value,
-                        func.date(BannerModel.end_datetime) == datetime_value,
-                        func.date(BannerModel.created) == datetime_value,
-                        func.date(BannerModel.updated) == datetime_value,
-                    ]
-                )
+            match, rank = compile_query(query_param)
+            filters.append(match)
+            if params.get("sort") == "bestmatch" and rank is not None:
+                if search_params["cursor"] is not None:
+                    raise ValidationError(
+                        "Cursors cannot be used with the best match sort.",
+                        field_name="cursor",
+                    )
+                search_params["rank"] = rank
+
+        filters.extend(date_range_predicates(params))
+        search_params["fields"] = self._sparse_fields(params.get("fields"))
 
         banners = self.record_cls.search(search_params, filters)
+        links_search = (
+            self.config.links_search_keyset
+            if search_params["cursor"] is not None
+            else self.config.links_search
+        )
 
         return self.result_list(
             self,
             identity,
             banners,
             params=search_params,
-            links_tpl=LinksTemplate(self.config.links_search, context={"args": params}),
+            links_tpl=LinksTemplate(links_search, context={"args": params}),
             links_item_tpl=self.links_item_tpl,
         )
 
+    def _sparse_fields(self, fields):
+        """Validate the ``fields`` of a sparse fieldset, in the schema order.
+
+        Accepts a list or a comma separated string, the id is always included.
+        """
+        if not fields:
+            return None
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        fields = {field.strip() for field in fields} - {""}
+        declared = self.config.schema_summary._declared_fields
+        unknown = fields - set(declared)
+        if unknown:
+            raise ValidationError(
+                f"Unknown fields: {', '.join(sorted(unknown))}.",
+                field_name="fields",
+            )
+        fields.add("id")
+        return tuple(name for name in declared if name in fields)
+
     def create(self, identity, data, raise_errors=True):
         """Create a banner."""
         self.require_permission(identity, "create")
@@ -131,21 +212,151 @@ class BannerService(RecordService):
             links_tpl=self.links_item_tpl,
         )
 
-    def disable_expired(self, identity):
-        """Disable expired banners."""
-        self.require_permission(identity, "disable")
-        self.record_cls.disable_expired()
-
-    def _validate_bool(self, value):
+    def _load_many(self, identity, data, with_id=False):
+        """Validate many banners, return the valid ones and per-item errors.
+
+        Valid items are returned as ``(index, id, data)``, ``id`` is ``None``
+        unless ``with_id`` is set.
+        """
+        if not isinstance(data, list):
+            raise ValidationError("Expected a list of banners.")
+        max_items = current_app.config["BANNERS_BULK_MAX_ITEMS"]
+        if len(data) > max_items:
+            raise ValidationError(f"At most {max_items} banners can be sent at once.")
+        return self._validate_many(identity, data, with_id)
+
+    def _validate_many(self, identity, data, with_id=False):
+        """Validate each banner of a list in a single pass."""
+        categories = [c[0] for c in current_app.config["BANNERS_CATEGORIES"]]
+        valid, errors = [], []
+        for index, item in enumerate(data):
+            item = dict(item) if isinstance(item, dict) else {}
+            id_ = item.pop("id", None) if with_id else None
+            try:
+                if with_id:
+                    id_ = self._load_id(id_)
+                valid_data, _ = self.schema.load(
+                    item, context={"identity": identity}, raise_errors=True
+                )
+                if valid_data["category"] not in categories:
+                    raise ValidationError("Invalid category.", field_name="category")
+            except ValidationError as e:
+                errors.append(
+                    {"index": index, "errors": validation_error_to_list_errors(e)}
+                )
+                continue
+            valid.append((index, id_, valid_data))
+        return valid, errors
+
+    @staticmethod
+    def _load_id(id_):
+        if id_ is None:
+            raise ValidationError("Missing data for required field.", field_name="id")
         try:
-            bool_value = distutils.util.strtobool(value)
-        except ValueError:
-            return None
-        return bool(bool_value)
+            return int(id_)
+        except (TypeError, ValueError):
+            raise ValidationError("Not a valid integer.", field_name="id")
 
-    def _validate_datetime(self, value):
-        try:
-            date_value = arrow.get(value).date()
-        except ValueError:
-            return None
-        return date_value
+    def create_many(self, identity, data):
+        """Create many banners in a single transaction."""
+        self.require_permission(identity, "create")
+
+        valid, errors = self._load_many(identity, data)
+        banners = self.record_cls.create_many([item for _, _, item in valid])
+
+        return self.config.result_bulk_cls(
+            self, identity, banners, errors, links_tpl=self.links_item_tpl
+        )
+
+    def import_many(self, identity, data):
+        """Insert many banners, e.g. from an export, in a single statement.
+
+        Ids and dump-only fields of the items are ignored. The banners are
+        not read back, returns the number of inserted banners and the
+        per-item errors of the others.
+        """
+        self.require_permission(identity, "create")
+
+        valid, errors = self._validate_many(identity, data)
+        self.record_cls.insert_many([item for _, _, item in valid])
+
+        return len(valid), errors
+
+    def update_many(self, identity, data):
+        """Update many banners, each identified by its ``id``, in one transaction."""
+        self.require_permission(identity, "update")
+
+        valid, errors = self._load_many(identity, data, with_id=True)
+        existing = self.record_cls.get_many([id_ for _, id_, _ in valid])
+        items = []
+        for index, id_, item in valid:
+            if id_ not in existing:
+                errors.append(self._not_found_error(index, id_))
+                continue
+            items.append((existing[id_], item))
+        banners = self.record_cls.update_many(items)
+
+        return self.config.result_bulk_cls(
+            self,
+            identity,
+            banners,
+            sorted(errors, key=itemgetter("index")),
+            links_tpl=self.links_item_tpl,
+        )
+
+    def delete_many(self, identity, data):
+        """Delete many banners, given by ``{"ids": [...]}``, in one transaction."""
+        self.require_permission(identity, "delete")
+
+        data = self.config.schema_bulk_delete().load(data)
+        ids = data["ids"]
+        max_items = current_app.config["BANNERS_BULK_MAX_ITEMS"]
+        if len(ids) > max_items:
+            raise ValidationError(
+                f"At most {max_items} banners can be sent at once.", field_name="ids"
+            )
+
+        existing = self.record_cls.get_many(ids)
+        banners, errors, seen = [], [], set()
+        for index, id_ in enumerate(ids):
+            if id_ in seen:
+                # a repeated id is deleted once
+                continue
+            seen.add(id_)
+            if id_ in existing:
+                banners.append(existing[id_])
+            else:
+                errors.append(self._not_found_error(index, id_))
+        deleted_ids = [banner.id for banner in banners]
+        self.record_cls.delete_many(banners)
+
+        return self.config.result_bulk_cls(self, identity, deleted_ids, errors)
+
+    def export(self, identity):
+        """Export all the banners, fetched and serialized in batches."""
+        self.require_permission(identity, "export")
+
+        batch_size = current_app.config["BANNERS_EXPORT_BATCH_SIZE"]
+        return self.config.result_export_cls(
+            self,
+            identity,
+            self.record_cls.iter_all(batch_size),
+            batch_size,
+        )
+
+    @staticmethod
+    def _not_found_error(index, id_):
+        return {
+            "index": index,
+            "errors": [
+                {
+                    "field": "id",
+                    "messages": [BannerNotExistsError(id_).description],
+                }
+            ],
+        }
+
+    def disable_expired(self, identity):
+        """Disable expired banners, return the ids of the disabled ones."""
+        self.require_permission(identity, "disable")
+        return self.record_cls.disable_expired()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Synthetic banners, for load tests and benchmarks.
+
+The generated datasets are deterministic for a given seed and reference
+time, and shaped like the banners of a long running instance: mostly expired
+banners, a few live and scheduled ones, on url paths of varied depth.
+"""
+
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+
+from .records.models import BannerModel
+
+SEGMENTS = [
+    ["records", "communities", "search", "uploads", "me", "help", "administration"],
+    ["{id}", "requests", "settings", "members", "curation", "new"],
+    ["files", "versions", "export", "{id}", "preview"],
+]
+"""Url path segments per level, the last level is reused by deeper ones."""
+
+WORDS = (
+    "scheduled maintenance release storage upgrade outage read only mode new "
+    "feature community records search service degraded performance planned "
+    "downtime please save your work the will be unavailable from until"
+).split()
+
+
+class BannerGenerator:
+    """Deterministic generator of banner data.
+
+    :param seed: Seed of the random generator.
+    :param now: Reference time of the schedules, defaults to the current minute.
+    :param categories: Weight of each category.
+    :param expired: Fraction of banners that already ended.
+    :param live: Fraction of banners currently running, the rest are scheduled.
+    :param global_: Fraction of banners shown on every url path.
+    :param max_depth: Maximum number of url path segments.
+    :param history: How far back the expired banners go.
+    :param duration: Minimum and maximum duration of a banner, the longer the
+        more the schedules overlap.
+    :param open_ended: Fraction of live and scheduled banners without an end.
+    :param message_size: Minimum and maximum length of the messages.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        now=None,
+        categories=None,
+        expired=0.9,
+        live=0.05,
+        global_=0.1,
+        max_depth=5,
+        history=timedelta(days=5 * 365),
+        duration=(timedelta(hours=1), timedelta(days=14)),
+        open_ended=0.2,
+        message_size=(20, 500),
+    ):
+        """Constructor."""
+        if expired + live > 1:
+            raise ValueError("The expired and live fractions exceed 1.")
+        if message_size[0] > message_size[1]:
+            raise ValueError("The minimum message size exceeds the maximum.")
+        self.seed = seed
+        self.now = now or datetime.utcnow().replace(second=0, microsecond=0)
+        self.categories = categories or {"info": 6, "warning": 3, "other": 1}
+        self.expired = expired
+        self.live = live
+        self.global_ = global_
+        self.max_depth = max_depth
+        self.history = history
+        self.duration = duration
+        self.open_ended = open_ended
+        self.message_size = message_size
+
+    def _url_path(self, rand):
+        if rand.random() < self.global_:
+            return None
+        segments = []
+        for level in range(rand.randint(0, self.max_depth)):
+            segment = rand.choice(SEGMENTS[min(level, len(SEGMENTS) - 1)])
+            segments.append(segment.format(id=rand.randint(1, 50)))
+        return "/" + "/".join(segments)
+
+    def _message(self, rand):
+        size = rand.randint(*self.message_size)
+        words = []
+        length = -1
+        while length < size:
+            word = rand.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        text = " ".join(words)[:size]
+        # some formatting, as in the messages written in the admin panel
+        if size > 40 and rand.random() < 0.5:
+            return f"<p><strong>{text[:20]}</strong>{text[20:]}</p>"
+        return text
+
+    def _schedule(self, rand):
+        """Return the start and end of a banner, and whether it is active."""
+        low, high = (d.total_seconds() for d in self.duration)
+        duration = timedelta(seconds=rand.uniform(low, high))
+        state = rand.random()
+        if state < self.expired:
+            end = self.now - timedelta(
+                seconds=rand.uniform(1, self.history.total_seconds())
+            )
+            # expired banners are disabled by the periodic task
+            return end - duration, end, False
+        open_ended = rand.random() < self.open_ended
+        if state < self.expired + self.live:
+            start = self.now - duration * rand.random()
+        else:
+            start = self.now + timedelta(seconds=rand.uniform(60, high))
+        return start, None if open_ended else start + duration, True
+
+    def generate(self, count):
+        """Iterate over ``count`` banners, as data for ``BannerModel``."""
+        rand = random.Random(self.seed)
+        population = list(self.categories)
+        weights = list(self.categories.values())
+        for _ in range(count):
+            start, end, active = self._schedule(rand)
+            yield {
+                "message": self._message(rand),
+                "url_path": self._url_path(rand),
+                "category": rand.choices(population, weights)[0],
+                "start_datetime": start,
+                "end_datetime": end,
+                "active": active,
+            }
+
+
+def seed_banners(count, generator=None, chunk_size=10000, progress=None):
+    """Insert ``count`` synthetic banners, ``chunk_size`` per statement.
+
+    ``progress`` is called with the number of banners inserted so far after
+    each chunk. Returns the number of inserted banners.
+    """
+    banners = (generator or BannerGenerator()).generate(count)
+    inserted = 0
+    while True:
+        chunk = list(islice(banners, chunk_size))
+        if not chunk:
+            return inserted
+        BannerModel.insert_many(chunk)
+        inserted += len(chunk)
+        if progress is not None:
+            progress(inserted)
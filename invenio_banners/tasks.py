@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Background tasks for banners."""
+
+from datetime import datetime
+
+from celery import shared_task
+from flask import current_app
+from invenio_access.permissions import system_identity
+
+from .proxies import current_banners_service
+from .records.models import BannerModel
+
+
+@shared_task(ignore_result=True)
+def disable_expired_banners():
+    """Disable the active banners that already ended."""
+    current_banners_service.disable_expired(system_identity)
+
+
+@shared_task(ignore_result=True)
+def schedule_banners_transition():
+    """Queue the expiry of the banners at the next banner transition.
+
+    Meant to run every ``BANNERS_TRANSITION_LOOKAHEAD``, so it only queues
+    the task when the transition happens before its next run. The active
+    banners snapshots of the web processes expire at the transition on
+    their own.
+    """
+    transition = BannerModel.get_next_transition()
+    if transition is None:
+        return None
+    lookahead = current_app.config["BANNERS_TRANSITION_LOOKAHEAD"]
+    if transition - datetime.utcnow() > lookahead:
+        return None
+
+    disable_expired_banners.apply_async(eta=transition)
+    return transition
@@ -7,15 +7,43 @@
 
 """Utils."""
 
-from flask import request
+from flask import current_app, request
+from invenio_i18n import get_locale
 
-from invenio_banners.services.config import BannerModel
+from invenio_banners.cache import request_memo
+from invenio_banners.proxies import current_active_banners_cache
 
 
 def get_active_banners_for_request():
     """Get active banner for the current URL path request."""
     url_path = request.path
-    return BannerModel.get_active(url_path)
+    memo = request_memo()
+    key = ("banners", url_path)
+    if key not in memo:
+        memo[key] = current_active_banners_cache.get(url_path)
+    return memo[key]
+
+
+def render_active_banners_for_request():
+    """Render active banners for the current URL path request."""
+    url_path = request.path
+    locale = str(get_locale())
+    memo = request_memo()
+    key = ("html", url_path, locale)
+    if key not in memo:
+        memo[key] = current_active_banners_cache.snapshot.render(
+            url_path, locale, current_app.config["BANNERS_ACTIVE_TEMPLATE"]
+        )
+    return memo[key]
+
+
+def prefetch_active_banners():
+    """Load the active banners before the request is handled.
+
+    Meant to be registered as a ``before_request`` hook, so that templates
+    never hit the database while rendering.
+    """
+    get_active_banners_for_request()
 
 
 def style_category(category):
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmarks configuration.
+
+The benchmarks are skipped by the test suite, and run on demand without the
+coverage, which would skew the timings, nor the linters, on synthetic banner
+sets of the sizes listed in ``BANNERS_BENCHMARK_SIZES`` (comma separated,
+``10,1000`` by default). To save a run of the benchmarks::
+
+    export BANNERS_BENCHMARK_SIZES=10,1000,100000
+    python -m pytest tests/benchmarks -o addopts= --benchmark-only --benchmark-autosave
+
+and ``pytest-benchmark compare`` to compare the saved runs across releases.
+"""
+
+import os
+
+import pytest
+from invenio_db import db
+
+from invenio_banners.records.models import BannerModel
+from invenio_banners.synthetic import BannerGenerator, seed_banners
+
+SIZES = [
+    int(size)
+    for size in os.environ.get("BANNERS_BENCHMARK_SIZES", "10,1000").split(",")
+]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _without_coverage(request):
+    """Skip the benchmarks when the coverage is measured."""
+    option = request.config.option
+    if getattr(option, "cov_source", None) and not getattr(option, "no_cov", False):
+        pytest.skip("Benchmarks do not run with coverage, use --no-cov.")
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size}-banners")
+def banner_set(request, database):
+    """Seed the banners table with a synthetic set, return its size."""
+    size = request.param
+    BannerModel.query.delete()
+    db.session.commit()
+    seed_banners(size, BannerGenerator(seed=0))
+    yield size
+    BannerModel.query.delete()
+    db.session.commit()
+
+
+@pytest.fixture()
+def bench(benchmark, banner_set):
+    """Benchmark fixture grouping the results per banner set size."""
+    benchmark.group = f"{benchmark.group or benchmark.name}[{banner_set}]"
+    benchmark.extra_info["banners"] = banner_set
+    return benchmark
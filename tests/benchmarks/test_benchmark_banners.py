@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark the banner lookups and the search."""
+
+import pytest
+from invenio_access.permissions import system_identity
+
+from invenio_banners.proxies import current_active_banners_cache
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.records.models import BannerModel
+
+pytest.importorskip("pytest_benchmark")
+
+URL_PATH = "/records/search/me"
+
+TEMPLATE = """
+{%- from "semantic-ui/invenio_banners/banner.html" import banner -%}
+{{ banner() }}
+"""
+
+
+@pytest.mark.benchmark(group="get_active", warmup=True)
+def test_get_active(app, bench):
+    """Query the banners active for a url path."""
+    bench(BannerModel.get_active, URL_PATH)
+
+
+@pytest.mark.benchmark(group="macro", warmup=True)
+def test_macro_render(app, bench):
+    """Render the banners of a request, from the active banners snapshot."""
+    template = app.jinja_env.from_string(TEMPLATE)
+
+    def render():
+        with app.test_request_context(URL_PATH):
+            return template.render()
+
+    render()
+    bench(render)
+
+
+@pytest.mark.benchmark(group="macro-cold", warmup=True)
+def test_macro_render_cold(app, bench):
+    """Render the banners of a request, rebuilding the snapshot first."""
+    template = app.jinja_env.from_string(TEMPLATE)
+
+    def render():
+        with app.test_request_context(URL_PATH):
+            return template.render()
+
+    bench.pedantic(
+        render,
+        setup=current_active_banners_cache.invalidate,
+        rounds=20,
+        warmup_rounds=1,
+    )
+
+
+@pytest.mark.benchmark(group="search", warmup=True)
+def test_service_search(app, bench):
+    """Search a page of banners matching a query."""
+    params = {"q": "category:info active:true", "size": 25}
+    bench(service.search, system_identity, params)
+
+
+@pytest.mark.benchmark(group="to_dict", warmup=True)
+def test_list_to_dict(app, bench):
+    """Dump a page of 100 banners, with their links."""
+    result = service.search(system_identity, {"size": 100})
+    bench(result.to_dict)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark dumping a page of 1000 banners."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from invenio_banners.records import BannerModel
+from invenio_banners.services.dumpers import compile_dumper
+from invenio_banners.services.schemas import BannerSchema
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def page():
+    """Page of 1000 detached banners."""
+    start = datetime(2024, 1, 1)
+    return [
+        BannerModel(
+            id=i,
+            message=f"banner {i}",
+            url_path=f"/records/{i}" if i % 2 else None,
+            category="info",
+            start_datetime=start + timedelta(hours=i),
+            end_datetime=start + timedelta(days=i) if i % 3 else None,
+            active=True,
+            created=start,
+            updated=start,
+        )
+        for i in range(1000)
+    ]
+
+
+@pytest.mark.benchmark(group="dump-1000")
+def test_marshmallow_dump(benchmark, page):
+    """Dump with the marshmallow schema, as the service did."""
+    benchmark(lambda: [BannerSchema(context={}).dump(b) for b in page])
+
+
+@pytest.mark.benchmark(group="dump-1000")
+def test_compiled_dump(benchmark, page):
+    """Dump with the compiled dumper."""
+    dump = compile_dumper(BannerSchema, BannerModel)
+    result = benchmark(lambda: [dump(b) for b in page])
+    assert result == [BannerSchema().dump(b) for b in page]
@@ -46,15 +46,19 @@ banners = {
 def test_disable_expired(app):
     """Test clean up old announcement but still active."""
     BannerModel.create(banners["everywhere"])
-    BannerModel.create(banners["expired"])
+    expired = BannerModel.create(banners["expired"])
     BannerModel.create(banners["valid"])
     BannerModel.create(banners["sub_records_only"])
 
     assert BannerModel.query.filter(BannerModel.active.is_(True)).count() == 4
 
-    BannerModel.disable_expired()
+    assert BannerModel.disable_expired() == [expired.id]
 
-    _banners = BannerModel.query.filter(BannerModel.active.is_(True)).all()
+    _banners = (
+        BannerModel.query.filter(BannerModel.active.is_(True))
+        .order_by(BannerModel.id)
+        .all()
+    )
     assert len(_banners) == 3
     assert _banners[0].message == "everywhere"
     assert _banners[1].message == "valid"
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test that the banner queries are served by indexes."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import asc, text
+
+from invenio_banners.records.models import BannerModel
+
+
+def _explain(db, query):
+    """Return the query plan of the query as a string."""
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statement = query.statement.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}")
+        return "\n".join(row[-1] for row in rows)
+    elif dialect == "postgresql":
+        # tables in tests are tiny, a sequential scan would always win
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        statement = query.statement.compile(dialect=connection.dialect)
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", statement.params)
+        return "\n".join(row[0] for row in rows)
+    pytest.skip(f"EXPLAIN is not supported for {dialect}")
+
+
+def _assert_uses_index(db, query, *indexes):
+    plan = _explain(db, query)
+    assert any(index in plan for index in indexes), plan
+
+
+def test_active_banners_use_index(app, db):
+    """Test the active banners lookup."""
+    now = datetime.utcnow()
+
+    _assert_uses_index(
+        db,
+        BannerModel._active_query(now),
+        "ix_banners_active_start_datetime_end_datetime",
+    )
+
+
+def test_expired_banners_use_index(app, db):
+    """Test the expired banners lookup."""
+    now = datetime.utcnow()
+    query = (
+        BannerModel.query.filter(BannerModel.active.is_(True))
+        .filter(BannerModel.end_datetime.isnot(None))
+        .filter(BannerModel.end_datetime < now)
+    )
+
+    _assert_uses_index(
+        db,
+        query,
+        "ix_banners_end_datetime_active",
+        "ix_banners_active_start_datetime_end_datetime",
+    )
+
+
+@pytest.mark.parametrize(
+    "sort,index",
+    [
+        ("url_path", "ix_banners_url_path"),
+        ("start_datetime", "ix_banners_start_datetime"),
+        ("end_datetime", "ix_banners_end_datetime"),
+        ("active", "ix_banners_active_start_datetime_end_datetime"),
+    ],
+)
+def test_sort_options_use_index(app, db, sort, index):
+    """Test the admin search sort options."""
+    query = BannerModel.query.order_by(asc(text(sort))).limit(25)
+
+    _assert_uses_index(db, query, index)
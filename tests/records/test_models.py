@@ -11,7 +11,12 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from invenio_banners.records.models import BannerModel
+from invenio_banners.records.models import (
+    URL_PATH_MAX_LENGTH,
+    BannerModel,
+    summarize_message,
+    url_path_prefixes,
+)
 from invenio_banners.services.errors import BannerNotExistsError
 
 banners = {
@@ -176,3 +181,70 @@ def test_category(app):
     with pytest.raises(AssertionError):
         banners["sub_records_only"]["category"] = "wrong"
         BannerModel.create(banners["sub_records_only"])
+
+
+def test_get_active_with_wildcard_characters(app):
+    """Test that LIKE wildcards in stored url paths are matched literally."""
+    BannerModel.create(
+        {
+            "message": "wildcards",
+            "url_path": "/rec_rds/100%",
+            "category": "info",
+            "start_datetime": datetime.utcnow() - timedelta(days=1),
+            "active": True,
+        }
+    )
+
+    assert BannerModel.get_active("/records/100abc") == []
+    assert BannerModel.get_active("/rec_rds/100%/sub")[0].message == "wildcards"
+
+
+def test_url_path_prefixes():
+    """Test the expansion of a url path into its prefixes."""
+    assert url_path_prefixes("/ab") == ["", "/", "/a", "/ab"]
+    assert len(url_path_prefixes("/" * 1000)) == URL_PATH_MAX_LENGTH + 1
+
+
+def test_get_next_transition(app, db):
+    """Test the next change of the set of active banners."""
+    BannerModel.query.delete()
+    now = datetime.utcnow()
+    assert BannerModel.get_next_transition(now) is None
+
+    BannerModel.create(banners["everywhere"])
+    assert BannerModel.get_next_transition(now) is None
+
+    end = now + timedelta(hours=2)
+    BannerModel.create(
+        {
+            **banners["valid"],
+            "start_datetime": now - timedelta(days=1),
+            "end_datetime": end,
+        }
+    )
+    assert BannerModel.get_next_transition(now) == end + timedelta(microseconds=1)
+
+    start = now + timedelta(hours=1)
+    BannerModel.create({**banners["disabled"], "start_datetime": start})
+    assert BannerModel.get_next_transition(now) == end + timedelta(microseconds=1)
+
+    BannerModel.create({**banners["valid"], "start_datetime": start})
+    assert BannerModel.get_next_transition(now) == start
+
+
+def test_summarize_message():
+    """Test that summaries are cut on the text, not on the markup."""
+    message = "<p><b>Planned</b> <i>downtime</i></p>"
+    assert summarize_message(message, 16) == "Planned downtime"
+    assert summarize_message(message, 10) == "Planned do…"
+    # the beginning of a longer message, ending in a cut tag
+    assert summarize_message("<p>Planned</p><a hr", 16, cut=True) == "Planned…"
+
+
+def test_summarize_message_entities():
+    """Test that entities are unescaped before measuring and cutting."""
+    message = "<p>Tom&nbsp;&amp;&nbsp;Jerry&#39;s</p>"
+    assert summarize_message(message, 15) == "Tom & Jerry's"
+    assert summarize_message(message, 5) == "Tom &…"
+    # the beginning of a longer message, ending in a cut entity
+    assert summarize_message("Tom&nbsp;&amp;&nb", 16, cut=True) == "Tom &…"
@@ -6,12 +6,15 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Banner resource tests."""
-from datetime import date, datetime
+import json
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qsl, urlsplit
 
 import pytest
 from invenio_records_resources.services.errors import PermissionDeniedError
 
 from invenio_banners.records import BannerModel
+from invenio_banners.records.pagination import encode_cursor
 
 banners = {
     "banner1": {
@@ -84,6 +87,11 @@ def _search_banners(client, status_code=None, query_string=None):
     return result
 
 
+def _link_args(link):
+    """Query arguments of a link."""
+    return dict(parse_qsl(urlsplit(link).query))
+
+
 def test_create_is_forbidden(client, user, headers):
     """Test that the simple user cannot create a new banner."""
     user.login(client)
@@ -120,6 +128,23 @@ def test_disable_expired_after_create_action(client, admin, headers):
     assert expired_banner.active is False
 
 
+def test_disable_expired_is_queued(client, admin, headers, monkeypatch):
+    """Expired banners are disabled by a task, not within the request."""
+    queued = []
+    monkeypatch.setattr(
+        "invenio_banners.resources.resource.disable_expired_banners.delay",
+        lambda: queued.append(True),
+    )
+    banner1 = BannerModel.create(banners["banner1"])
+
+    admin.login(client)
+
+    _create_banner(client, banners["banner2"], headers, 201)
+
+    assert BannerModel.get(banner1.id).active is True
+    assert queued == [True]
+
+
 def test_update_banner(client, admin, headers):
     """Update a banner."""
     # create banner first
@@ -357,6 +382,74 @@ def test_search_banner_with_params(client, user):
     assert result_hits["hits"][1]["message"] == "banner2"
 
 
+def test_search_banner_sparse_fields(client, user, db):
+    """Search for banners with a sparse fieldset."""
+    BannerModel.query.delete()
+    BannerModel.create(banners["banner1"])
+
+    user.login(client)
+
+    query_string = {"fields": "category,end_datetime"}
+    result = _search_banners(client, 200, query_string).json
+    (hit,) = result["hits"]["hits"]
+    assert set(hit) == {"id", "category", "end_datetime", "links"}
+    assert "fields=category" in result["links"]["self"]
+
+    _search_banners(client, 400, {"fields": "unknown"})
+
+
+def test_search_banner_keyset_pagination(client, user, db):
+    """Walk the search results with cursors."""
+    BannerModel.query.delete()
+    BannerModel.create(banners["banner1"])
+    BannerModel.create(banners["banner2"])
+    BannerModel.create(banners["banner3"])
+    BannerModel.create({**banners["banner3"], "message": "banner4"})
+
+    user.login(client)
+
+    query_string = {"size": "2", "sort": "end_datetime", "cursor": ""}
+    page = _search_banners(client, 200, query_string).json
+    assert [hit["message"] for hit in page["hits"]["hits"]] == ["banner2", "banner1"]
+    assert page["hits"]["total"] == 4
+    assert "prev" not in page["links"]
+
+    next_page = _search_banners(client, 200, _link_args(page["links"]["next"])).json
+    assert [hit["message"] for hit in next_page["hits"]["hits"]] == [
+        "banner3",
+        "banner4",
+    ]
+    assert "next" not in next_page["links"]
+
+    prev_page = _search_banners(client, 200, _link_args(next_page["links"]["prev"]))
+    prev_page = prev_page.json
+    assert prev_page["hits"]["hits"] == page["hits"]["hits"]
+
+    query_string["cursor"] = "not a cursor"
+    _search_banners(client, 400, query_string)
+
+    # values not matching the types of the sort columns
+    for values in [[None, "abc"], [None, True], [None, None], [1, 1]]:
+        query_string["cursor"] = encode_cursor(values)
+        _search_banners(client, 400, query_string)
+
+
+def test_search_banner_date_ranges(client, user, db):
+    """Search for banners within date ranges."""
+    BannerModel.query.delete()
+    BannerModel.create(banners["banner1"])
+    BannerModel.create(banners["banner2"])
+    BannerModel.create(banners["banner3"])
+
+    user.login(client)
+
+    query_string = {"start_from": "2022-12-15", "end_to": "2023-02-01T00:00:00Z"}
+    result_hits = _search_banners(client, 200, query_string).json["hits"]
+    assert [hit["message"] for hit in result_hits["hits"]] == ["banner2"]
+
+    _search_banners(client, 400, {"start_from": "yesterday"})
+
+
 def test_search_banner_empty_list(client, user):
     """Search for banners (no banner found)."""
     user.login(client)
@@ -366,3 +459,140 @@ def test_search_banner_empty_list(client, user):
     result = banners["hits"]
     assert len(result["hits"]) == 0
     assert result["total"] == 0
+
+
+def test_read_active_banners(client, user):
+    """Read the banners active for a url path."""
+    now = datetime.utcnow()
+    BannerModel.create(
+        {
+            "message": "active",
+            "url_path": "/records",
+            "category": "info",
+            "active": True,
+            "start_datetime": now - timedelta(days=1),
+            "end_datetime": now + timedelta(seconds=30),
+        }
+    )
+    BannerModel.create(banners["banner1"])
+
+    res = client.get("/banners/active", query_string={"url_path": "/records/1"})
+    assert res.status_code == 200
+    hits = res.json["hits"]
+    assert hits["total"] == 1
+    assert hits["hits"][0]["message"] == "active"
+
+    etag = res.headers["ETag"]
+    assert res.cache_control.public
+    # bounded by the end of the active banner
+    assert 0 <= res.cache_control.max_age <= 30
+
+    res = client.get(
+        "/banners/active",
+        query_string={"url_path": "/records/1"},
+        headers={"If-None-Match": etag},
+    )
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert not res.data
+
+    # as sent back by a proxy compressing the responses
+    res = client.get(
+        "/banners/active",
+        query_string={"url_path": "/records/1"},
+        headers={"If-None-Match": f"W/{etag}"},
+    )
+    assert res.status_code == 304
+
+    res = client.get("/banners/active", query_string={"url_path": "/other"})
+    assert res.status_code == 200
+    assert res.json["hits"]["total"] == 0
+
+
+def test_read_active_banners_many(client, user, headers):
+    """Read the banners active for many url paths at once."""
+    BannerModel.create(
+        {
+            "message": "records",
+            "url_path": "/records",
+            "category": "info",
+            "active": True,
+            "start_datetime": datetime.utcnow() - timedelta(days=1),
+        }
+    )
+
+    res = client.post(
+        "/banners/active",
+        headers=headers,
+        json={"url_paths": ["/records/1", "/communities"]},
+    )
+    assert res.status_code == 200
+    hits = res.json["hits"]
+    assert [hit["message"] for hit in hits["/records/1"]] == ["records"]
+    assert hits["/communities"] == []
+
+    res = client.post("/banners/active", headers=headers, json={"url_paths": "/"})
+    assert res.status_code == 400
+
+
+def test_bulk_banners(client, admin, headers, db):
+    """Create and delete many banners at once."""
+    admin.login(client)
+    data = {
+        "message": "bulk",
+        "category": "info",
+        "start_datetime": "2024-01-01 00:00:00",
+        "active": True,
+    }
+
+    res = client.post(
+        "/banners/_bulk", headers=headers, json=[data, {**data, "message": None}]
+    )
+    assert res.status_code == 200
+    assert res.json["hits"]["total"] == 1
+    assert res.json["errors"][0]["index"] == 1
+    banner_id = res.json["hits"]["hits"][0]["id"]
+
+    res = client.put(
+        "/banners/_bulk",
+        headers=headers,
+        json=[{**data, "id": banner_id, "active": False}],
+    )
+    assert res.status_code == 200
+    assert res.json["hits"]["hits"][0]["active"] is False
+
+    res = client.delete("/banners/_bulk", headers=headers, json={"ids": [banner_id]})
+    assert res.status_code == 200
+    assert res.json == {"hits": {"hits": [{"id": banner_id}], "total": 1}, "errors": []}
+
+    res = client.post("/banners/_bulk", headers=headers, json={"not": "a list"})
+    assert res.status_code == 400
+
+
+def test_export_banners(client, admin, user, db):
+    """Stream the export of all the banners."""
+    BannerModel.query.delete()
+    BannerModel.create(banners["banner1"])
+    BannerModel.create(banners["banner2"])
+
+    admin.login(client)
+    res = client.get("/banners/_export")
+    assert res.status_code == 200
+    assert res.mimetype == "application/x-ndjson"
+    assert res.headers["Content-Disposition"] == "attachment; filename=banners.ndjson"
+    assert [json.loads(line)["message"] for line in res.text.splitlines()] == [
+        "banner1",
+        "banner2",
+    ]
+
+    res = client.get("/banners/_export", query_string={"format": "csv"})
+    assert res.mimetype == "text/csv"
+    assert res.text.splitlines()[0].startswith("id,")
+    assert len(res.text.splitlines()) == 3
+
+    assert client.get("/banners/_export?format=xml").status_code == 400
+
+    admin.logout(client)
+    user.login(client)
+    with pytest.raises(PermissionDeniedError):
+        client.get("/banners/_export")
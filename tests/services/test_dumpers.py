@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Compiled dumper tests."""
+
+import json
+from datetime import datetime
+
+from marshmallow import post_dump
+from marshmallow.decorators import POST_DUMP
+
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.records import BannerModel
+from invenio_banners.services.dumpers import compile_dumper
+from invenio_banners.services.schemas import BannerSchema
+
+
+def test_compiled_dumper_is_identical(app, db, simple_user_identity):
+    """The compiled dumper produces the same JSON as marshmallow."""
+    BannerModel.query.delete()
+    for i, end in enumerate([None, datetime(2024, 2, 1, 10, 30, 0, 123456)]):
+        BannerModel.create(
+            {
+                "message": f"<b>banner {i}</b> é",
+                "url_path": "/records" if i else None,
+                "category": "info",
+                "active": bool(i),
+                "start_datetime": datetime(2024, 1, 1),
+                "end_datetime": end,
+            }
+        )
+    banner = BannerModel.query.first()
+
+    app.config["BANNERS_COMPILED_DUMPER"] = False
+    try:
+        expected_list = service.search(simple_user_identity, {}).to_dict()
+        expected_item = service.read(simple_user_identity, banner.id).to_dict()
+    finally:
+        app.config["BANNERS_COMPILED_DUMPER"] = True
+    result_list = service.search(simple_user_identity, {}).to_dict()
+    result_item = service.read(simple_user_identity, banner.id).to_dict()
+
+    assert json.dumps(result_list) == json.dumps(expected_list)
+    assert json.dumps(result_item) == json.dumps(expected_item)
+
+
+def test_hooks_are_not_compiled():
+    """Schemas with dump hooks are left to marshmallow."""
+
+    class HookedSchema(BannerSchema):
+        @post_dump
+        def add(self, data, **kwargs):
+            return data
+
+    def legacy_hook(self, data, **kwargs):
+        return data
+
+    # hooks keyed by ``(tag, many)``, as before marshmallow 3.22
+    legacy_hook.__marshmallow_hook__ = {(POST_DUMP, False): {}}
+    LegacyHookedSchema = type(
+        "LegacyHookedSchema", (BannerSchema,), {"legacy_hook": legacy_hook}
+    )
+
+    assert compile_dumper(BannerSchema, BannerModel) is not None
+    assert compile_dumper(HookedSchema, BannerModel) is None
+    assert compile_dumper(LegacyHookedSchema, BannerModel) is None
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Banner permission checks tests."""
+
+import pytest
+from invenio_records_resources.services.errors import PermissionDeniedError
+
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.services.permissions import BannersPermissionPolicy, public_actions
+
+
+def test_public_actions():
+    """Only the actions granted to any user are public."""
+    assert public_actions(BannersPermissionPolicy) == {"read", "search"}
+
+
+def test_public_actions_skip_the_policy(app, simple_user_identity, monkeypatch):
+    """Public reads do not build a permission policy."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("policy evaluated")
+
+    monkeypatch.setattr(service, "permission_policy", fail)
+    service.require_permission(simple_user_identity, "read")
+    service.require_permission(simple_user_identity, "search")
+
+
+def test_permissions_are_cached_per_request(app, simple_user_identity, monkeypatch):
+    """Other actions are evaluated once per identity and request."""
+    calls = []
+    permission_policy = service.permission_policy
+
+    def counting(action_name, **kwargs):
+        calls.append(action_name)
+        return permission_policy(action_name, **kwargs)
+
+    monkeypatch.setattr(service, "permission_policy", counting)
+    with app.test_request_context():
+        for _ in range(3):
+            with pytest.raises(PermissionDeniedError):
+                service.require_permission(simple_user_identity, "create")
+    with app.test_request_context():
+        assert not service.check_permission(simple_user_identity, "create")
+    assert calls == ["create", "create"]
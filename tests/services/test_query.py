@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Banner search query syntax tests."""
+
+from datetime import datetime
+
+import pytest
+from marshmallow import ValidationError
+
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.records import BannerModel
+from invenio_banners.services.query import Term, parse_query
+
+
+def test_parse_query():
+    """Parse fields, operators and free text."""
+    terms = parse_query(
+        "maintenance category:Warning active:true start:>=2024-01-01 "
+        'end:<2024-02-01T10:00 path:/records message:"planned downtime" '
+        "https://example.org"
+    )
+    assert terms == (
+        Term(None, None, "maintenance"),
+        Term("category", "=", "warning"),
+        Term("active", "=", True),
+        Term("start_datetime", ">=", (datetime(2024, 1, 1), True)),
+        Term("end_datetime", "<", (datetime(2024, 2, 1, 10), False)),
+        Term("url_path", "=", "/records"),
+        Term("message", "=", "planned downtime"),
+        Term(None, None, "https://example.org"),
+    )
+    # the parsed query is cached per query string
+    assert parse_query("active:true") is parse_query("active:true")
+
+
+@pytest.mark.parametrize(
+    "query", ["active:maybe", "start:>yesterday", "end:2024-13-01"]
+)
+def test_parse_invalid_query(query):
+    """Invalid field values are reported on the query parameter."""
+    with pytest.raises(ValidationError) as e:
+        parse_query(query)
+    assert e.value.field_name == "q"
+
+
+def test_search_with_fields(app, db, simple_user_identity):
+    """Search for banners with a structured query."""
+    BannerModel.query.delete()
+    for message, url_path, category, active, start in [
+        ("one", "/records", "warning", True, datetime(2024, 1, 1, 12)),
+        ("two", "/records/sub", "info", True, datetime(2024, 1, 2)),
+        ("three", "/communities", "warning", False, datetime(2024, 1, 3)),
+        ("four", "/records_extra", "warning", True, datetime(2023, 12, 31)),
+    ]:
+        BannerModel.create(
+            {
+                "message": message,
+                "url_path": url_path,
+                "category": category,
+                "active": active,
+                "start_datetime": start,
+            }
+        )
+
+    def search(q):
+        result = service.search(simple_user_identity, {"q": q})
+        return [hit["message"] for hit in result.hits]
+
+    assert search("category:warning active:true") == ["four", "one"]
+    assert search("path:/records/") == ["two"]
+    assert search("start:2024-01-01") == ["one"]
+    assert search("start:>2024-01-01") == ["two", "three"]
+    assert search("start:<=2024-01-01 active:yes") == ["four", "one"]
+    assert search("start:>=2024-01-01T12:00 start:<2024-01-03") == ["one", "two"]
+    assert search("o category:warning") == ["four", "one", "three"]
+    assert search("message:thr") == ["three"]
+    # wildcards are matched literally
+    assert search("message:%") == []
+    assert search("message:t_o") == []
+
+
+def test_search_with_date_ranges(app, db, simple_user_identity):
+    """Search for banners within half-open date ranges."""
+    BannerModel.query.delete()
+    for message, start, end in [
+        ("one", datetime(2024, 1, 1), datetime(2024, 1, 10)),
+        ("two", datetime(2024, 1, 5), None),
+        ("three", datetime(2024, 1, 10), datetime(2024, 2, 1)),
+    ]:
+        BannerModel.create(
+            {
+                "message": message,
+                "category": "info",
+                "start_datetime": start,
+                "end_datetime": end,
+            }
+        )
+
+    def search(**params):
+        result = service.search(simple_user_identity, params)
+        return [hit["message"] for hit in result.hits]
+
+    assert search(start_from=datetime(2024, 1, 5)) == ["two", "three"]
+    assert search(start_to=datetime(2024, 1, 10)) == ["one", "two"]
+    assert search(start_from=datetime(2024, 1, 2), start_to=datetime(2024, 1, 6)) == [
+        "two"
+    ]
+    assert search(end_to=datetime(2024, 2, 1)) == ["one"]
+    assert search(q="category:info", end_from=datetime(2024, 1, 10)) == [
+        "one",
+        "three",
+    ]
@@ -7,13 +7,20 @@
 
 """Service level tests for Banners."""
 
+import csv
+import io
+import json
 from datetime import datetime, timedelta
 
 import pytest
+import sqlalchemy as sa
+from invenio_records_resources.services import LinksTemplate
 from invenio_records_resources.services.errors import PermissionDeniedError
+from marshmallow import ValidationError
 
 from invenio_banners.proxies import current_banners_service as service
 from invenio_banners.records import BannerModel
+from invenio_banners.services.config import BannersLink
 from invenio_banners.services.errors import BannerNotExistsError
 
 banners = {
@@ -192,6 +199,147 @@ def test_search_banner_with_params(app, simple_user_identity):
     assert result_list[1]["message"] == "active"
 
 
+def test_search_banner_keyset_pagination(app, db, simple_user_identity):
+    """Search for banners with cursors, NULL values sorted last."""
+    BannerModel.query.delete()
+    start = datetime(2023, 1, 1)
+    for i in range(5):
+        BannerModel.create(
+            {
+                "message": f"banner{i}",
+                "category": "info",
+                "active": True,
+                "start_datetime": start,
+                "end_datetime": start + timedelta(days=i) if i % 2 else None,
+            }
+        )
+
+    for sort_direction, expected in [
+        ("asc", ["banner1", "banner3", "banner0", "banner2", "banner4"]),
+        ("desc", ["banner3", "banner1", "banner4", "banner2", "banner0"]),
+    ]:
+        params = {
+            "sort": "end_datetime",
+            "sort_direction": sort_direction,
+            "size": 2,
+            "cursor": "",
+        }
+        pages = []
+        while True:
+            result = service.search(simple_user_identity, params)
+            pages.append([hit["message"] for hit in result.hits])
+            page = result.pagination
+            if not page.has_next:
+                break
+            params["cursor"] = page.next_cursor
+        assert sum(pages, []) == expected
+        assert result.total == 5
+
+        # walk back from the last page
+        params["cursor"] = page.prev_cursor
+        result = service.search(simple_user_identity, params)
+        assert [hit["message"] for hit in result.hits] == pages[-2]
+        assert result.pagination.has_next
+
+
+def test_search_banner_without_total(app, db, simple_user_identity):
+    """Search for banners without counting all the matches."""
+    BannerModel.query.delete()
+    for i in range(5):
+        BannerModel.create({**banners["other"], "message": f"banner{i}"})
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement.lower())
+
+    engine = db.engine
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        params = {"size": 2, "track_total": False}
+        first = service.search(simple_user_identity, params)
+        last = service.search(simple_user_identity, {**params, "page": 3})
+        first_dict, last_dict = first.to_dict(), last.to_dict()
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert not [s for s in statements if "count(" in s]
+    assert [hit["message"] for hit in first_dict["hits"]["hits"]] == [
+        "banner0",
+        "banner1",
+    ]
+    assert first_dict["hits"]["total"] == 3
+    assert "next" in first_dict["links"]
+    assert [hit["message"] for hit in last_dict["hits"]["hits"]] == ["banner4"]
+    assert last_dict["hits"]["total"] == 5
+    assert "next" not in last_dict["links"]
+
+    assert service.search(simple_user_identity, {"size": 2}).total == 5
+
+
+def test_search_banner_sparse_fields(app, db, simple_user_identity):
+    """Search for banners loading and dumping only some fields."""
+    BannerModel.query.delete()
+    message = "<p>Scheduled <b>maintenance</b></p>" + " of the storage" * 40
+    BannerModel.create({**banners["other"], "message": message})
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement.lower())
+
+    engine = db.engine
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        params = {"fields": "category,url_path,message_summary", "cursor": ""}
+        hits = service.search(simple_user_identity, params).to_dict()["hits"]
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    # the count only reads the rows, the messages are never fetched
+    fetched = [s for s in statements if "count(" not in s]
+    assert fetched and not [s for s in fetched if "banners.message " in s]
+    (hit,) = hits["hits"]
+    assert set(hit) == {"id", "category", "url_path", "message_summary", "links"}
+    summary = hit["message_summary"]
+    assert summary.startswith("Scheduled maintenance of the storage of")
+    assert summary.endswith("…")
+    length = app.config["BANNERS_MESSAGE_SUMMARY_LENGTH"]
+    assert length <= len(summary) <= length + 1
+
+    # short text in a lot of markup is complete
+    BannerModel.query.delete()
+    text = "Planned downtime " * 8
+    message = "".join(f'<span class="x">{word}</span> ' for word in text.split())
+    assert len(message) > length > len(text)
+    BannerModel.create({**banners["other"], "message": message})
+    hits = service.search(simple_user_identity, params).to_dict()["hits"]
+    assert hits["hits"][0]["message_summary"] == text.strip()
+
+    with pytest.raises(ValidationError):
+        service.search(simple_user_identity, {"fields": "category,secret"})
+
+
+def test_search_banner_item_links(app, db, simple_user_identity):
+    """Item links compiled once per page match the template expansion."""
+    BannerModel.query.delete()
+    for key in ["active", "other"]:
+        BannerModel.create(banners[key])
+    links_tpl = LinksTemplate(service.config.links_item)
+
+    result = service.search(simple_user_identity, {})
+    expected = [
+        links_tpl.expand(simple_user_identity, banner)
+        for banner in result.banners_result()
+    ]
+    assert [hit["links"] for hit in result.hits] == expected
+    assert expected[0]["self"].endswith(f"/api/banners/{result.banners_result()[0].id}")
+
+    # links with conditions are expanded per banner
+    conditional = BannersLink("{+api}/banners/{id}", when=lambda b, ctx: b.active)
+    assert conditional.compile({"api": "/api"}) is None
+
+
 def test_search_banner_empty_list(app, simple_user_identity):
     """Search for banners (no banner found)."""
     banner_list = service.search(simple_user_identity, {})
@@ -221,3 +369,122 @@ def test_disable_expired_is_forbidden(app, simple_user_identity):
     """Test that the simple user cannot disable a banner."""
     with pytest.raises(PermissionDeniedError):
         service.disable_expired(simple_user_identity)
+
+
+def test_read_active_banners(app, simple_user_identity):
+    """Read the banners active for a url path."""
+    BannerModel.create(banners["records_only"])
+    BannerModel.create(banners["sub_records_only"])
+    BannerModel.create(banners["inactive"])
+
+    result = service.read_active(simple_user_identity, "/resources/sub/1")
+
+    assert [hit["message"] for hit in result.hits] == [
+        "records_only",
+        "sub_records_only",
+    ]
+    assert result.etag
+    assert result.max_age == app.config["BANNERS_ACTIVE_MAX_AGE"]
+
+    BannerModel.create(banners["active"])
+    assert service.read_active(simple_user_identity, "/").etag != result.etag
+
+
+def test_read_active_banners_many(app, simple_user_identity):
+    """Read the banners active for many url paths at once."""
+    BannerModel.create(banners["records_only"])
+    BannerModel.create(banners["sub_records_only"])
+
+    result = service.read_active_many(
+        simple_user_identity, {"url_paths": ["/resources/sub", "/resources", "/"]}
+    )
+
+    hits = result.to_dict()["hits"]
+    assert [h["message"] for h in hits["/resources/sub"]] == [
+        "records_only",
+        "sub_records_only",
+    ]
+    assert [h["message"] for h in hits["/resources"]] == ["records_only"]
+    assert hits["/"] == []
+
+    url_paths = ["/"] * (app.config["BANNERS_ACTIVE_MAX_URL_PATHS"] + 1)
+    with pytest.raises(ValidationError):
+        service.read_active_many(simple_user_identity, {"url_paths": url_paths})
+
+
+def test_bulk_operations(app, db, superuser_identity):
+    """Create, update and delete many banners at once."""
+    BannerModel.query.delete()
+    data = {
+        "message": "bulk",
+        "category": "info",
+        "start_datetime": "2024-01-01 00:00:00",
+        "active": True,
+    }
+
+    result = service.create_many(
+        superuser_identity,
+        [data, {**data, "category": "unknown"}, {**data, "message": "bulk2"}],
+    ).to_dict()
+    assert [hit["message"] for hit in result["hits"]["hits"]] == ["bulk", "bulk2"]
+    assert [error["index"] for error in result["errors"]] == [1]
+    assert result["errors"][0]["errors"][0]["field"] == "category"
+    ids = [hit["id"] for hit in result["hits"]["hits"]]
+
+    result = service.update_many(
+        superuser_identity,
+        [
+            {**data, "id": ids[0], "message": "updated"},
+            {**data, "id": 0},
+            {**data, "message": "no id"},
+        ],
+    ).to_dict()
+    assert [hit["message"] for hit in result["hits"]["hits"]] == ["updated"]
+    assert [error["index"] for error in result["errors"]] == [1, 2]
+    assert BannerModel.get(ids[0]).message == "updated"
+
+    result = service.delete_many(
+        superuser_identity, {"ids": ids + [0, ids[0], 0]}
+    ).to_dict()
+    assert result["hits"]["hits"] == [{"id": ids[0]}, {"id": ids[1]}]
+    assert [error["index"] for error in result["errors"]] == [2]
+    assert BannerModel.query.count() == 0
+
+
+def test_bulk_operations_are_forbidden(app, simple_user_identity):
+    """Test that the simple user cannot write many banners."""
+    with pytest.raises(PermissionDeniedError):
+        service.create_many(simple_user_identity, [banners["active"]])
+    with pytest.raises(PermissionDeniedError):
+        service.delete_many(simple_user_identity, {"ids": [1]})
+
+
+def test_export(app, db, superuser_identity, monkeypatch):
+    """Export all the banners, one batch at a time."""
+    BannerModel.query.delete()
+    for i in range(5):
+        BannerModel.create({**banners["other"], "message": f"banner,{i}"})
+    monkeypatch.setitem(app.config, "BANNERS_EXPORT_BATCH_SIZE", 2)
+
+    chunks = list(service.export(superuser_identity).serialize("ndjson"))
+    assert len(chunks) == 3
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [line["message"] for line in lines] == [f"banner,{i}" for i in range(5)]
+    assert "links" not in lines[0]
+
+    export = service.export(superuser_identity)
+    rows = list(csv.DictReader(io.StringIO("".join(export.serialize("csv")))))
+    assert [row["message"] for row in rows] == [f"banner,{i}" for i in range(5)]
+    assert list(rows[0]) == export.fields
+    assert rows[0]["url_path"] == "/other"
+
+    BannerModel.query.delete()
+    export = service.export(superuser_identity)
+    assert list(export.serialize("ndjson")) == []
+    assert list(export.serialize("csv")) == [",".join(export.fields) + "\r\n"]
+
+
+def test_export_is_forbidden(app, simple_user_identity):
+    """Test that the simple user cannot export the banners."""
+    with pytest.raises(PermissionDeniedError):
+        service.export(simple_user_identity)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the active banners cache."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from invenio_banners.cache import (
+    ActiveBanner,
+    BannersIndex,
+    BannersSnapshot,
+    request_memo,
+)
+from invenio_banners.proxies import current_active_banners_cache
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.records.models import BannerModel
+from invenio_banners.utils import (
+    get_active_banners_for_request,
+    prefetch_active_banners,
+)
+
+banners = {
+    "everywhere": {
+        "message": "everywhere",
+        "url_path": None,
+        "category": "info",
+        "start_datetime": datetime.utcnow() - timedelta(days=1),
+        "active": True,
+    },
+    "records_only": {
+        "message": "records_only",
+        "url_path": "/records",
+        "category": "warning",
+        "start_datetime": datetime.utcnow() - timedelta(days=1),
+        "active": True,
+    },
+}
+
+
+@pytest.fixture()
+def cache(app, db):
+    """Empty active banners cache."""
+    current_active_banners_cache.invalidate()
+    yield current_active_banners_cache
+    current_active_banners_cache.invalidate()
+
+
+@pytest.fixture()
+def count_loads(monkeypatch):
+    """Count the database loads of the active banners."""
+    calls = []
+    get_all_active = BannerModel.get_all_active
+
+    def _get_all_active(*args):
+        calls.append(1)
+        return get_all_active(*args)
+
+    monkeypatch.setattr(BannerModel, "get_all_active", _get_all_active)
+    return calls
+
+
+def _messages(url_path):
+    return [b.message for b in current_active_banners_cache.get(url_path)]
+
+
+def test_snapshot_is_reused(app, cache, count_loads):
+    """Test that repeated lookups are served from memory."""
+    BannerModel.create(banners["everywhere"])
+    BannerModel.create(banners["records_only"])
+
+    with app.test_request_context("/records/1234"):
+        result = get_active_banners_for_request()
+        assert [b.message for b in result] == ["everywhere", "records_only"]
+        get_active_banners_for_request()
+
+    assert _messages("/") == ["everywhere"]
+    assert len(count_loads) == 1
+
+
+def test_snapshot_expires_after_ttl(app, cache, count_loads):
+    """Test that the snapshot is rebuilt once its TTL elapsed."""
+    _messages("/")
+    cache.snapshot.expires_at = 0
+    _messages("/")
+
+    assert len(count_loads) == 2
+
+
+def test_snapshot_expires_on_schedule(app, cache):
+    """Test that the snapshot is rebuilt when a banner starts."""
+    start = datetime.utcnow() + timedelta(hours=1)
+    BannerModel.create({**banners["records_only"], "start_datetime": start})
+
+    assert _messages("/records") == []
+    snapshot = cache.snapshot
+    assert snapshot.valid_until == start
+    assert not snapshot.expired
+
+    snapshot.valid_until = datetime.utcnow()
+    assert snapshot.expired
+
+
+def test_invalidated_on_service_writes(app, cache, admin):
+    """Test that writes through the service are visible immediately."""
+    identity = admin.identity
+    assert _messages("/records") == []
+
+    banner = service.create(identity, banners["records_only"])
+    assert _messages("/records") == ["records_only"]
+
+    new_data = {
+        "message": "updated",
+        "url_path": "/records",
+        "category": "warning",
+        "start_datetime": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        "active": True,
+    }
+    service.update(identity, banner["id"], new_data)
+    assert _messages("/records") == ["updated"]
+
+    service.delete(identity, banner["id"])
+    assert _messages("/records") == []
+
+
+def test_invalidation_while_building(app, cache, monkeypatch):
+    """Test that a snapshot built across a commit is not kept."""
+    build = BannersSnapshot.build
+
+    def build_and_invalidate(*args):
+        snapshot = build(*args)
+        # a concurrent write committed while the snapshot was being built
+        cache.invalidate()
+        return snapshot
+
+    monkeypatch.setattr(BannersSnapshot, "build", build_and_invalidate)
+    cache.refresh()
+    assert cache._snapshot is None
+
+    monkeypatch.setattr(BannersSnapshot, "build", build)
+    assert cache.refresh() is cache._snapshot
+
+
+def test_memoized_per_request(app, cache):
+    """Test that lookups are memoized for the rest of the request."""
+    with app.test_request_context("/records"):
+        prefetch_active_banners()
+        assert ("banners", "/records") in request_memo()
+
+        result = get_active_banners_for_request()
+        assert result == []
+        assert get_active_banners_for_request() is result
+
+        # a write in the request drops the memoized lookups
+        BannerModel.create(banners["records_only"])
+        result = get_active_banners_for_request()
+        assert [b.message for b in result] == ["records_only"]
+
+
+def test_memo_does_not_outlive_the_request(app, cache):
+    """Test that the memo of a request is not reused by the next one."""
+    # the application context of the tests outlives the requests
+    with app.test_request_context("/records"):
+        get_active_banners_for_request()
+        assert ("banners", "/records") in request_memo()
+
+    with app.test_request_context("/records"):
+        assert request_memo() == {}
+
+
+def test_index_resolves_prefixes():
+    """Test the url path radix tree against a linear scan."""
+    url_paths = [
+        None,
+        "",
+        "/",
+        "/records",
+        "/records/1234",
+        "/records/12",
+        "/rec",
+        "/recordsets",
+        "/communities/sub",
+        "/communities",
+    ]
+    active = [
+        ActiveBanner(i, str(url_path), url_path, "info", None, None)
+        for i, url_path in enumerate(url_paths)
+    ]
+    index = BannersIndex(active)
+
+    for url_path in [
+        "/",
+        "/r",
+        "/records",
+        "/records/1234/files",
+        "/records/125",
+        "/recordsets",
+        "/communities/su",
+        "/other",
+        "",
+    ]:
+        expected = [
+            b for b in active if b.url_path is None or url_path.startswith(b.url_path)
+        ]
+        assert index.resolve(url_path) == expected
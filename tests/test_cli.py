@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the banners command line interface."""
+
+import json
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from invenio_banners.cli import banners
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.proxies import current_banners_text_index
+from invenio_banners.records.models import BannerModel
+
+
+def _banner(message, **kwargs):
+    return {
+        "message": message,
+        "category": "info",
+        "start_datetime": "2024-01-01T00:00:00",
+        "active": True,
+        **kwargs,
+    }
+
+
+def test_import_ndjson(app, db, tmp_path):
+    """Import banners in chunks, reporting the invalid rows."""
+    BannerModel.query.delete()
+    rows = [_banner(f"banner{i}") for i in range(5)]
+    rows[3]["category"] = None
+    source = tmp_path / "banners.ndjson"
+    source.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+    current_banners_text_index.index
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lower().startswith("insert"):
+            statements.append(many)
+
+    sa.event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        runner = app.test_cli_runner()
+        result = runner.invoke(banners, ["import", str(source), "--chunk-size", "2"])
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert result.exit_code == 1
+    assert "Row 4: category" in result.output
+    assert "Imported 4 banners, 1 rows failed." in result.output
+    # one statement per chunk, an executemany for the chunks of many rows
+    assert statements == [True, False, False]
+    messages = [banner.message for banner in BannerModel.query.order_by("id")]
+    assert messages == ["banner0", "banner1", "banner2", "banner4"]
+    # the inserts invalidate the caches
+    assert current_banners_text_index._index is None
+
+
+def test_import_export_csv(app, db, admin, tmp_path):
+    """An export imports back."""
+    BannerModel.query.delete()
+    start = datetime(2024, 1, 1)
+    BannerModel.create(
+        _banner("first, with a comma", url_path="/records", start_datetime=start)
+    )
+    BannerModel.create(
+        _banner("second", start_datetime=start, end_datetime=datetime(2024, 2, 1))
+    )
+    export = service.export(admin.identity)
+    source = tmp_path / "banners.csv"
+    source.write_text("".join(export.serialize("csv")))
+    BannerModel.query.delete()
+
+    result = app.test_cli_runner().invoke(banners, ["import", str(source)])
+
+    assert result.exit_code == 0, result.output
+    assert "Imported 2 banners, 0 rows failed." in result.output
+    first, second = BannerModel.query.order_by("id")
+    assert (first.message, first.url_path, first.end_datetime) == (
+        "first, with a comma",
+        "/records",
+        None,
+    )
+    assert second.url_path is None
+    assert second.end_datetime.month == 2
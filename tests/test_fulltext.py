@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the banners text search."""
+
+from collections import namedtuple
+
+import sqlalchemy as sa
+
+from invenio_banners.fulltext import TextIndexCache, TrigramIndex
+from invenio_banners.proxies import current_banners_service as service
+from invenio_banners.proxies import current_banners_text_index
+from invenio_banners.records.models import BannerModel
+
+Row = namedtuple("Row", ["id", "message", "url_path", "category"])
+
+
+def test_index_matches_substrings():
+    """Test the trigram index against a linear scan."""
+    rows = [
+        Row(1, "Scheduled maintenance", "/records", "warning"),
+        Row(2, "New release", None, "info"),
+        Row(3, "Maintenance done", "/communities", "info"),
+        Row(4, "Read the docs", "/records/1234", "other"),
+    ]
+    index = TrigramIndex(rows)
+
+    for query in ["maintenance", "MAIN", "re", "/records/", "info", "xyz", "e"]:
+        expected = {
+            row.id
+            for row in rows
+            if any(query.lower() in (v or "").lower() for v in row[1:])
+        }
+        assert {id_ for id_, _ in index.search(query)} == expected
+
+    # the match covering most of its field comes first
+    assert [id_ for id_, _ in index.search("maintenance")] == [3, 1]
+
+
+def test_search_bestmatch(app, db, admin):
+    """Test that the search ranks the matches and follows the writes."""
+    BannerModel.query.delete()
+    for message in ["Maintenance of the storage tonight", "Maintenance"]:
+        BannerModel.create({"message": message, "category": "info"})
+
+    params = {"q": "maintenance", "sort": "bestmatch"}
+    result = service.search(admin.identity, params)
+    assert [hit["message"] for hit in result.hits] == [
+        "Maintenance",
+        "Maintenance of the storage tonight",
+    ]
+    assert current_banners_text_index._index is not None
+
+    service.create(
+        admin.identity,
+        {
+            "message": "maintenance!",
+            "category": "info",
+            "start_datetime": "2024-01-01 00:00:00",
+            "active": True,
+        },
+    )
+    assert current_banners_text_index._index is None
+    assert service.search(admin.identity, params).total == 3
+
+    result = service.search(admin.identity, {"q": "storage"})
+    assert [hit["message"] for hit in result.hits] == [
+        "Maintenance of the storage tonight"
+    ]
+
+
+def test_index_expires(app, db, monkeypatch):
+    """The index is rebuilt once expired, and not kept if invalidated."""
+    cache = TextIndexCache()
+    index = cache.index
+    assert cache.index is index
+
+    monkeypatch.setitem(app.config, "BANNERS_TEXT_INDEX_TTL", 0)
+    cache.invalidate()
+    index = cache.index
+    assert cache.index is not index
+
+    # a write committed while building must not be hidden by the new index
+    build = TrigramIndex.build
+
+    def build_and_invalidate():
+        index = build()
+        cache.invalidate()
+        return index
+
+    monkeypatch.setitem(app.config, "BANNERS_TEXT_INDEX_TTL", None)
+    monkeypatch.setattr(TrigramIndex, "build", build_and_invalidate)
+    cache.index
+    assert cache._index is None
+
+
+def test_search_statement_size(app, db, admin):
+    """The statements do not grow with the number of matches."""
+    BannerModel.query.delete()
+    for i in range(50):
+        BannerModel.create({"message": f"banner {i}", "category": "info"})
+    BannerModel.create({"message": "info", "category": "warning"})
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lower().startswith("select banners"):
+            statements.append(statement)
+
+    sa.event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        few = service.search(admin.identity, {"q": "warning", "sort": "bestmatch"})
+        many = service.search(
+            admin.identity, {"q": "info banner", "sort": "bestmatch", "size": 5}
+        )
+        assert few.total == 1
+        assert many.total == 50
+        assert [hit["message"] for hit in many.hits] == [
+            f"banner {i}" for i in range(5)
+        ]
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    # the matches are not inlined in the statements
+    assert statements
+    assert max(len(s) for s in statements) < 1500
+
+    result = service.search(admin.identity, {"q": "banner 4", "sort": "bestmatch"})
+    assert next(iter(result.hits))["message"] == "banner 4"
+    assert result.total == 14
@@ -10,6 +10,7 @@
 from flask import Flask
 
 from invenio_banners import InvenioBanners
+from invenio_banners.utils import prefetch_active_banners
 
 
 def test_version():
@@ -30,3 +31,15 @@ def test_init():
     assert "invenio-banners" not in app.extensions
     ext.init_app(app)
     assert "invenio-banners" in app.extensions
+
+
+def test_init_prefetch():
+    """Test the registration of the prefetch hook."""
+    app = Flask("testapp")
+    InvenioBanners(app)
+    assert prefetch_active_banners not in app.before_request_funcs.get(None, [])
+
+    app = Flask("testapp")
+    app.config["BANNERS_PREFETCH_ACTIVE"] = True
+    InvenioBanners(app)
+    assert prefetch_active_banners in app.before_request_funcs[None]
@@ -11,7 +11,9 @@ from datetime import datetime
 
 import pytest
 from flask import url_for
+from invenio_i18n import force_locale
 
+from invenio_banners.proxies import current_active_banners_cache
 from invenio_banners.records.models import BannerModel
 from invenio_banners.utils import style_category
 
@@ -75,3 +77,28 @@ def test_jinja_macro(app, db):
     assert EXPECTED_MSG in html
     assert style.endswith(EXPECTED_STYLE)
     assert style in html
+
+
+def test_jinja_macro_fragment_cache(app, db):
+    """Test that the rendered banners are cached per banner set and locale."""
+    tpl = """
+    {%- from "semantic-ui/invenio_banners/banner.html" import banner -%}
+    {{ banner() }}
+    """
+    template = app.jinja_env.from_string(tpl)
+    _create_banner("Cached banner message", "warning")
+
+    html = template.render()
+    assert "Cached banner message" in html
+
+    snapshot = current_active_banners_cache.snapshot
+    assert len(snapshot.fragments) == 1
+    (fragment,) = snapshot.fragments.values()
+    assert fragment.strip() == html.strip()
+
+    assert template.render() == html
+    assert len(snapshot.fragments) == 1
+
+    with force_locale("de"):
+        template.render()
+    assert len(snapshot.fragments) == 2
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the synthetic banners generator."""
+
+from collections import Counter
+from datetime import datetime
+
+from invenio_banners.cli import banners
+from invenio_banners.records.models import BannerModel
+from invenio_banners.synthetic import BannerGenerator
+
+NOW = datetime(2024, 6, 1)
+
+
+def test_generator_is_deterministic():
+    """The same seed and reference time give the same banners."""
+    first = list(BannerGenerator(seed=1, now=NOW).generate(50))
+    assert first == list(BannerGenerator(seed=1, now=NOW).generate(50))
+    assert first != list(BannerGenerator(seed=2, now=NOW).generate(50))
+
+
+def test_generator_distributions():
+    """The banners follow the configured distributions."""
+    generator = BannerGenerator(
+        now=NOW,
+        categories={"info": 1, "warning": 1},
+        expired=0.5,
+        live=0.3,
+        max_depth=3,
+        message_size=(10, 100),
+    )
+    banners = list(generator.generate(2000))
+
+    assert set(Counter(b["category"] for b in banners)) == {"info", "warning"}
+    expired = [b for b in banners if b["end_datetime"] and b["end_datetime"] < NOW]
+    live = [b for b in banners if b["start_datetime"] <= NOW and b not in expired]
+    assert 900 < len(expired) < 1100
+    assert 500 < len(live) < 700
+    assert not any(b["active"] for b in expired)
+    for banner in banners:
+        url_path = banner["url_path"]
+        assert url_path is None or url_path.count("/") <= 3
+        assert 10 <= len(banner["message"]) <= 100 + len("<p><strong></strong></p>")
+
+
+def test_seed_command(app, db):
+    """The seed command inserts the banners in chunks."""
+    BannerModel.query.delete()
+
+    result = app.test_cli_runner().invoke(
+        banners, ["seed", "--count", "25", "--chunk-size", "10", "--live", "0.1"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Inserted 20 banners." in result.output
+    assert "Seeded 25 banners." in result.output
+    assert BannerModel.query.count() == 25
+
+    result = app.test_cli_runner().invoke(banners, ["seed", "--categories", "x=1"])
+    assert result.exit_code == 2
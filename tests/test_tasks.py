@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# Invenio-Banners is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Test the banner background tasks, run eagerly."""
+
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from invenio_banners.records.models import BannerModel
+from invenio_banners.tasks import disable_expired_banners, schedule_banners_transition
+
+
+def _create(**kwargs):
+    return BannerModel.create(
+        {"message": "banner", "category": "info", "active": True, **kwargs}
+    )
+
+
+def test_beat_schedule(app):
+    """The periodic tasks are registered in the beat schedule."""
+    schedule = app.config["CELERY_BEAT_SCHEDULE"]
+    assert schedule["banners-disable-expired"]["task"] == disable_expired_banners.name
+    assert (
+        schedule["banners-schedule-transition"]["task"]
+        == schedule_banners_transition.name
+    )
+    assert (
+        schedule["banners-schedule-transition"]["schedule"]
+        == app.config["BANNERS_TRANSITION_LOOKAHEAD"]
+    )
+
+
+def test_beat_schedule_follows_lookahead(app):
+    """The transition task runs as often as the configured lookahead."""
+    other = Flask("other")
+    other.config["BANNERS_CELERY_BEAT_SCHEDULE"] = app.config[
+        "BANNERS_CELERY_BEAT_SCHEDULE"
+    ]
+    other.config["BANNERS_TRANSITION_LOOKAHEAD"] = timedelta(minutes=1)
+
+    app.extensions["invenio-banners"].init_beat_schedule(other)
+
+    schedule = other.config["CELERY_BEAT_SCHEDULE"]
+    assert schedule["banners-schedule-transition"]["schedule"] == timedelta(minutes=1)
+    assert schedule["banners-disable-expired"]["schedule"] == timedelta(minutes=10)
+
+
+def test_disable_expired_banners(app, db):
+    """Expired banners are disabled by the task."""
+    expired = _create(end_datetime=datetime.utcnow() - timedelta(days=1))
+
+    disable_expired_banners.delay()
+
+    assert BannerModel.get(expired.id).active is False
+
+
+def test_schedule_banners_transition(app, db):
+    """The expiry is queued only for transitions within the lookahead."""
+    BannerModel.query.delete()
+    now = datetime.utcnow()
+    banner = _create(start_datetime=now + timedelta(days=1))
+
+    assert schedule_banners_transition.delay().result is None
+
+    end = now + timedelta(minutes=1)
+    BannerModel.update({"end_datetime": end}, banner.id)
+    BannerModel.update({"start_datetime": now - timedelta(days=1)}, banner.id)
+
+    # the banner is gone right after its end
+    transition = schedule_banners_transition.delay().result
+    assert transition == end + timedelta(microseconds=1)